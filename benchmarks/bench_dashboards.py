@@ -0,0 +1,245 @@
+"""Headless rerun benchmarks for both dashboards.
+
+Drives each app with Streamlit's AppTest through a scripted set of
+interactions at several synthetic data scales and records, per step, the
+rerun wall time, tracemalloc peak memory and the size of the Plotly figure
+payloads sent to the browser. Every app x scale runs in its own process so
+cold-start numbers are real cold starts. The scaled data is written to
+synthetic/bench/ first: a tlg_synth.py dataset (TLG_DATA_DIR) for the TLG app
+and a profiles CSV (KIRKLEES_PROFILES) for the Kirklees comparison view.
+
+    python benchmarks/bench_dashboards.py --out bench.json
+    python benchmarks/bench_dashboards.py --scales 10 100 --compare bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+DEFAULT_SCALES = [10, 50, 200]
+# Relative slowdown / growth flagged by --compare
+REGRESSION_THRESHOLD = 0.2
+
+DATA_DIR = os.path.join(REPO_ROOT, "synthetic", "bench")
+
+
+# ---------------------------------------------------------
+# SCALED DATASETS
+# ---------------------------------------------------------
+def _tlg_env(scale):
+    # Generated dataset: the 10 real accelerators plus synthetic ones (tlg_synth.py)
+    from tlg_synth import generate
+
+    out = os.path.join(DATA_DIR, f"tlg_{scale}")
+    generate(out, scale)
+    return {"TLG_DATA_DIR": out}
+
+
+def _kirklees_env(scale):
+    # Kirklees plus (scale - 1) dummy areas, loaded as a profiles CSV
+    from kirklees_profile import dummy_area_profiles
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"kirklees_{scale}.csv")
+    dummy_area_profiles(scale).to_csv(path, index=False)
+    return {"KIRKLEES_PROFILES": path}
+
+
+# Scale -> environment for each app (see tlg_data.py / kirklees_dashboard.py)
+APPS = {"streamlit_app.py": _tlg_env, "kirklees_dashboard.py": _kirklees_env}
+
+
+# ---------------------------------------------------------
+# SCRIPTED INTERACTIONS
+# ---------------------------------------------------------
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def _tlg_steps(at):
+    accelerators = _widget(at.sidebar.selectbox, "Select accelerator").options
+    yield "select accelerator", lambda: _widget(
+        at.sidebar.selectbox, "Select accelerator"
+    ).set_value(accelerators[-1])
+    yield "flip survey wave", lambda: _widget(
+        at.radio, "Select survey wave"
+    ).set_value("Wave 3")
+    yield "switch question set", lambda: _widget(
+        at.selectbox, "Select question set"
+    ).set_value("Team learning and feedback culture")
+    yield "dark theme", lambda: _widget(at.sidebar.radio, "Theme").set_value("Dark")
+    yield "light theme", lambda: _widget(at.sidebar.radio, "Theme").set_value("Light")
+
+
+def _kirklees_steps(at):
+    zoom = "Use zoomed y-axis for each chart (otherwise 0–100%)"
+    yield "toggle zoom_all off", lambda: _widget(at.checkbox, zoom).uncheck()
+    yield "toggle zoom_all on", lambda: _widget(at.checkbox, zoom).check()
+    yield "show projection", lambda: _widget(
+        at.checkbox, "Show projection for the next two periods"
+    ).check()
+    yield "compare areas", lambda: _widget(at.radio, "View").set_value("Compare areas")
+    yield "back to profile", lambda: _widget(at.radio, "View").set_value("Kirklees profile")
+
+
+STEPS = {"streamlit_app.py": _tlg_steps, "kirklees_dashboard.py": _kirklees_steps}
+
+
+def _payload(at):
+    return [len(chart.proto.spec.encode("utf-8")) for chart in at.get("plotly_chart")]
+
+
+def _run_session(app, track_memory):
+    # One scripted session; returns a record per step (the first is the cold start)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(REPO_ROOT, app), default_timeout=600)
+    records = []
+
+    def step(name, action):
+        if track_memory:
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        action()
+        at.run()
+        wall = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"{app} / {name}: {at.exception[0].message}")
+        record = {"step": name, "wall_s": wall}
+        if track_memory:
+            record["peak_mem_mb"] = tracemalloc.get_traced_memory()[1] / 1e6
+        else:
+            sizes = _payload(at)
+            record["payload_bytes"] = sum(sizes)
+            record["chart_bytes"] = sizes
+        records.append(record)
+
+    step("cold start", lambda: None)
+    for name, action in STEPS[app](at):
+        step(name, action)
+    return records
+
+
+def _measure(app):
+    # Child process: a timed pass, then a tracemalloc pass (tracing slows reruns
+    # down, so its timings are not used). Caches are cleared in between so the
+    # traced cold start rebuilds the data like the timed one did.
+    import streamlit as st
+
+    timed = _run_session(app, track_memory=False)
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    tracemalloc.start()
+    traced = _run_session(app, track_memory=True)
+    tracemalloc.stop()
+    for record, mem in zip(timed, traced):
+        record["peak_mem_mb"] = mem["peak_mem_mb"]
+    return timed
+
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def _run_child(app, scale):
+    env = dict(os.environ, **APPS[app](scale))
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", app],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"{app} at scale {scale} failed:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _git_rev():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _compare(results, previous_path):
+    with open(previous_path, encoding="utf-8") as fh:
+        previous = json.load(fh)
+    before = {
+        (r["app"], r["scale"], s["step"]): s for r in previous["results"] for s in r["steps"]
+    }
+    regressions = []
+    for r in results:
+        for s in r["steps"]:
+            old = before.get((r["app"], r["scale"], s["step"]))
+            if old is None:
+                continue
+            for key in ("wall_s", "peak_mem_mb", "payload_bytes"):
+                if old.get(key) and s[key] > old[key] * (1 + REGRESSION_THRESHOLD):
+                    regressions.append(
+                        f"{r['app']} @ {r['scale']} / {s['step']}: "
+                        f"{key} {old[key]:.3g} -> {s[key]:.3g}"
+                    )
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    parser.add_argument("--out", default="bench_results.json", help="JSON results file")
+    parser.add_argument("--compare", help="Previous results JSON to check for regressions")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure(args.child)))
+        return 0
+
+    import streamlit
+
+    results = []
+    for app in args.apps:
+        for scale in args.scales:
+            steps = _run_child(app, scale)
+            results.append({"app": app, "scale": scale, "steps": steps})
+            print(f"{app} @ {scale}")
+            for s in steps:
+                print(
+                    f"  {s['step']:<22}{s['wall_s']:>8.3f}s"
+                    f"{s['peak_mem_mb']:>9.1f} MB{s['payload_bytes'] / 1e3:>10.1f} kB"
+                )
+
+    report = {
+        "meta": {
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "streamlit": streamlit.__version__,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2)
+
+    if args.compare:
+        regressions = _compare(results, args.compare)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
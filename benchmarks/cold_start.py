@@ -0,0 +1,116 @@
+"""Cold-start time-to-first-paint for both dashboards.
+
+Each run starts a fresh Python process, executes the app once with Streamlit's
+AppTest and records how long the script takes to send its first element
+(first paint) and to finish. With --baseline the same measurement is taken
+for a git ref, and the exit code is non-zero if any app got more than
+REGRESSION_THRESHOLD slower to paint.
+
+    python benchmarks/cold_start.py
+    python benchmarks/cold_start.py --baseline 1407db9 --runs 7
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = ["streamlit_app.py", "kirklees_dashboard.py"]
+# Relative first-paint slowdown flagged by --baseline; smaller gaps are run-to-run jitter
+REGRESSION_THRESHOLD = 0.1
+
+
+def _measure(app_path):
+    # Child process: one cold run of one app
+    from streamlit.runtime.scriptrunner_utils.script_run_context import ScriptRunContext
+    from streamlit.testing.v1 import AppTest
+
+    first_paint = []
+    original_enqueue = ScriptRunContext.enqueue
+
+    def enqueue(self, msg):
+        if not first_paint and msg.HasField("delta"):
+            first_paint.append(time.perf_counter())
+        return original_enqueue(self, msg)
+
+    ScriptRunContext.enqueue = enqueue
+    at = AppTest.from_file(app_path, default_timeout=300)
+    start = time.perf_counter()
+    at.run()
+    end = time.perf_counter()
+    if at.exception:
+        raise RuntimeError(f"{app_path} raised: {at.exception[0].message}")
+    return {"first_paint_s": first_paint[0] - start, "total_s": end - start}
+
+
+def _cold_runs(tree, app, runs):
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", os.path.join(tree, app)],
+            cwd=tree,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        key: statistics.median(r[key] for r in results)
+        for key in ("first_paint_s", "total_s")
+    }
+
+
+def _export_ref(ref, dest):
+    archive = os.path.join(dest, "tree.tar")
+    subprocess.run(
+        ["git", "archive", "--format=tar", "-o", archive, ref], cwd=REPO_ROOT, check=True
+    )
+    with tarfile.open(archive) as tar:
+        tar.extractall(dest)
+    return dest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Cold runs per app (median)")
+    parser.add_argument("--baseline", help="Git ref to compare against")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure(args.child)))
+        return 0
+
+    results = {"current": {app: _cold_runs(REPO_ROOT, app, args.runs) for app in APPS}}
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            tree = _export_ref(args.baseline, tmp)
+            results["baseline"] = {app: _cold_runs(tree, app, args.runs) for app in APPS}
+
+    regressed = False
+    print(f"{'app':<24}{'first paint':>14}{'total':>10}{'baseline paint':>17}")
+    for app in APPS:
+        cur = results["current"][app]
+        line = f"{app:<24}{cur['first_paint_s']:>13.3f}s{cur['total_s']:>9.3f}s"
+        if args.baseline:
+            base = results["baseline"][app]
+            line += f"{base['first_paint_s']:>16.3f}s"
+            if cur["first_paint_s"] > base["first_paint_s"] * (1 + REGRESSION_THRESHOLD):
+                regressed = True
+                line += "  REGRESSED"
+        print(line)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    return 1 if regressed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Concurrent-session memory load test for both dashboards.
+
+Opens N Streamlit AppTest sessions of one app in a single process, as the
+server would for N simultaneous viewers, runs them concurrently and keeps
+them alive. Each session then picks its own selection and reruns. The report
+gives the memory of the first session (which builds the shared data
+registry) and the average added by each further session, from tracemalloc.
+Every app runs in its own process.
+
+    python benchmarks/load_test.py --sessions 100
+    python benchmarks/load_test.py --apps streamlit_app.py --sessions 20 50 --out load.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SESSIONS = [10, 50, 100]
+APPS = ["streamlit_app.py", "kirklees_dashboard.py"]
+
+
+# ---------------------------------------------------------
+# PER-SESSION SELECTIONS
+# ---------------------------------------------------------
+def _widget(widgets, label):
+    return next(w for w in widgets if w.label == label)
+
+
+def _tlg_select(at, i):
+    box = _widget(at.sidebar.selectbox, "Select accelerator")
+    box.set_value(box.options[i % len(box.options)])
+
+
+def _kirklees_select(at, i):
+    _widget(at.radio, "View").set_value(["Kirklees profile", "Compare areas"][i % 2])
+
+
+SELECT = {"streamlit_app.py": _tlg_select, "kirklees_dashboard.py": _kirklees_select}
+
+
+# ---------------------------------------------------------
+# CHILD PROCESS
+# ---------------------------------------------------------
+def _mb(n_bytes):
+    return round(n_bytes / 1e6, 2)
+
+
+def _measure(app, n_sessions, workers):
+    from streamlit.testing.v1 import AppTest
+
+    path = os.path.join(REPO_ROOT, app)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+
+    def open_session(i):
+        at = AppTest.from_file(path, default_timeout=600).run()
+        if at.exception:
+            raise RuntimeError(f"{app} session {i}: {at.exception[0].message}")
+        return at
+
+    def rerun(i, at):
+        SELECT[app](at, i)
+        at.run()
+        if at.exception:
+            raise RuntimeError(f"{app} session {i} rerun: {at.exception[0].message}")
+
+    # The first session builds the shared registry; the rest open concurrently
+    start = time.perf_counter()
+    sessions = [open_session(0)]
+    first = tracemalloc.get_traced_memory()[0]
+    with ThreadPoolExecutor(workers) as pool:
+        sessions += list(pool.map(open_session, range(1, n_sessions)))
+        opened = tracemalloc.get_traced_memory()[0]
+        open_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        list(pool.map(rerun, range(n_sessions), sessions))
+        rerun_s = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    extra = max(n_sessions - 1, 1)
+    return {
+        "app": app,
+        "sessions": n_sessions,
+        "first_session_mb": _mb(first - base),
+        "per_session_mb": _mb((opened - first) / extra),
+        "per_session_after_rerun_mb": _mb((current - first) / extra),
+        "total_mb": _mb(current - base),
+        "peak_mb": _mb(peak - base),
+        "open_s": round(open_s, 3),
+        "rerun_s": round(rerun_s, 3),
+    }
+
+
+# ---------------------------------------------------------
+# DRIVER
+# ---------------------------------------------------------
+def _run_child(app, n_sessions, workers):
+    out = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--child",
+            app,
+            "--sessions",
+            str(n_sessions),
+            "--workers",
+            str(workers),
+        ],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if out.returncode != 0:
+        raise RuntimeError(f"{app} with {n_sessions} sessions failed:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, nargs="+", default=DEFAULT_SESSIONS)
+    parser.add_argument("--apps", nargs="+", choices=APPS, default=APPS)
+    parser.add_argument("--workers", type=int, default=8, help="Sessions running at once")
+    parser.add_argument("--out", help="Write results as JSON to this file")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(_measure(args.child, args.sessions[0], args.workers)))
+        return 0
+
+    results = []
+    print(
+        f"{'app':<24}{'sessions':>9}{'first':>10}{'per session':>13}"
+        f"{'after rerun':>13}{'total':>10}{'rerun':>9}"
+    )
+    for app in args.apps:
+        for n in args.sessions:
+            r = _run_child(app, n, args.workers)
+            results.append(r)
+            print(
+                f"{app:<24}{n:>9}{r['first_session_mb']:>7.1f} MB"
+                f"{r['per_session_mb']:>10.2f} MB{r['per_session_after_rerun_mb']:>10.2f} MB"
+                f"{r['total_mb']:>7.1f} MB{r['rerun_s']:>8.2f}s"
+            )
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,512 @@
+import functools
+
+from instrumentation import timed
+
+# Shared pieces for streamlit_app.py and kirklees_dashboard.py: palettes, CSS,
+# layout templates, cached data loaders and figure factories.
+#
+# Only the standard library is imported at module level. Streamlit, pandas,
+# numpy and plotly are imported inside the functions that need them, so an
+# app can set its page config and paint its header before paying for them.
+
+# -------------------------------------------------------------------
+# ONS PALETTES
+# -------------------------------------------------------------------
+# ONS-style diverging Likert palette (approximate)
+ONS_5 = [
+    "#CC1F24",  # strong negative
+    "#F46A25",  # small extent / disagree
+    "#D9D9D9",  # neutral
+    "#2CA3A3",  # great extent / agree
+    "#005F83",  # very great extent / strongly agree
+]
+ONS_DK = "#B3B3B3"  # Don't know / NA
+
+PRE_COLOUR = "#959495"   # Vintage grey
+CURR_COLOUR = "#206095"  # Ocean blue
+PRE_SHADE = "rgba(149,148,149,0.25)"
+CURR_SHADE = "rgba(32,96,149,0.25)"
+FORECAST_COLOUR = "#27A0CC"  # Aqua
+FORECAST_SHADE = "rgba(39,160,204,0.2)"
+
+TEXT_GREY = "#595959"
+GRID_GREY = "#E5E5E5"
+
+# -------------------------------------------------------------------
+# CSS
+# -------------------------------------------------------------------
+FONT_CSS = """
+    <style>
+    * {
+        font-family: 'Verdana', sans-serif;
+    }
+    </style>
+"""
+
+SIDEBAR_CSS = """
+    <style>
+        [data-testid="stSidebar"] {
+            min-width: 220px;
+            max-width: 320px;
+        }
+    </style>
+"""
+
+DARK_THEME_CSS = """
+    <style>
+        .stApp {
+            background-color: #111111;
+            color: #F5F5F5;
+        }
+        [data-testid="stSidebar"] {
+            background-color: #222222;
+        }
+        h1, h2, h3, h4, h5, h6, p, label {
+            color: #F5F5F5;
+        }
+    </style>
+"""
+
+
+def configure_page(title, icon, css=()):
+    import streamlit as st
+
+    st.set_page_config(page_title=title, layout="wide", page_icon=icon)
+    for block in css:
+        st.markdown(block, unsafe_allow_html=True)
+
+
+# -------------------------------------------------------------------
+# LAYOUT TEMPLATES
+# -------------------------------------------------------------------
+def ons_layout(**overrides):
+    # White ONS chart background with light horizontal gridlines
+    layout = dict(
+        plot_bgcolor="#FFFFFF",
+        paper_bgcolor="#FFFFFF",
+        xaxis=dict(showgrid=False),
+        yaxis=dict(showgrid=True, gridcolor=GRID_GREY),
+    )
+    layout.update(overrides)
+    return layout
+
+
+# -------------------------------------------------------------------
+# CACHED DATA LOADERS
+# -------------------------------------------------------------------
+def _cache_data(func):
+    # st.cache_data, applied on first call so importing this module stays cheap
+    cached = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal cached
+        if cached is None:
+            import streamlit as st
+
+            cached = st.cache_data(func)
+        return cached(*args, **kwargs)
+
+    return wrapper
+
+
+def _cache_resource(func):
+    # st.cache_resource, applied lazily like _cache_data. The result is one
+    # object shared by every session in the process, not a copy per rerun.
+    cached = None
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        nonlocal cached
+        if cached is None:
+            import streamlit as st
+
+            cached = st.cache_resource(func)
+        return cached(*args, **kwargs)
+
+    return wrapper
+
+
+@_cache_resource
+def load_tlg_registry():
+    from tlg_data import build_registry
+
+    return build_registry()
+
+
+@_cache_resource
+def load_qual_index():
+    # Memory-mapped BM25 index over the coded segments, built on first use
+    from qual_search import open_dummy_index
+
+    return open_dummy_index(qual_df=load_tlg_registry()["qual_df"])
+
+
+@_cache_data
+def load_cooccurrence(acc_id, level, phase):
+    # Theme co-occurrence across one accelerator's documents, cached per filter
+    # combination. Only that accelerator's segments are built: build_segments
+    # gives the same segments for its rows of qual_df as for the whole table.
+    from qual_cooccurrence import cooccurrence, top_pairs
+    from tlg_data import QUAL_THEMATIC_GROUPS, build_segments
+
+    registry = load_tlg_registry()
+    qual_df = registry["qual_df"].iloc[registry["rows"]["qual_df"][acc_id]]
+    matrix, labels, n_docs = cooccurrence(
+        build_segments(qual_df),
+        "Thematic_group",
+        QUAL_THEMATIC_GROUPS,
+        Level=level,
+        Phase=phase,
+    )
+    return {"matrix": matrix, "labels": labels, "documents": n_docs, "pairs": top_pairs(matrix, labels)}
+
+
+def search_segments(query, **kwargs):
+    from qual_search import search
+
+    return search(load_qual_index(), query, **kwargs)
+
+
+def accelerator_rows(registry, frame, accelerator):
+    # Rows of one accelerator in a registry frame, by precomputed position
+    acc_id = registry["accelerator_index"][accelerator]
+    return registry[frame].iloc[registry["rows"][frame][acc_id]]
+
+
+def with_accelerator_names(registry, df):
+    # Swap Accelerator_id for the accelerator name, for display. Ids are row
+    # positions in the dimension table, so the join is a plain array lookup.
+    names = registry["accelerator_df"]["Accelerator"].to_numpy()
+    ids = df["Accelerator_id"].to_numpy()
+    df = df.drop(columns="Accelerator_id")
+    df.insert(0, "Accelerator", names[ids])
+    return df
+
+
+@_cache_resource
+def load_kirklees_profile():
+    from kirklees_profile import kirklees_frame
+
+    return kirklees_frame().assign(Area="Kirklees")
+
+
+@_cache_data
+def load_area_profiles(uploaded):
+    from kirklees_profile import load_area_profiles
+
+    return load_area_profiles(uploaded)
+
+
+@_cache_resource
+def load_dummy_profiles(n_areas):
+    from kirklees_profile import dummy_area_profiles
+
+    return dummy_area_profiles(n_areas)
+
+
+@_cache_resource
+def load_period_tests(profiles):
+    from profile_stats import period_tests
+
+    return period_tests(profiles)
+
+
+@_cache_resource
+def load_forecasts(profiles, horizon):
+    from profile_forecast import fit_forecasts
+
+    return fit_forecasts(profiles, horizon)[0]
+
+
+# -------------------------------------------------------------------
+# CHART OUTPUT
+# -------------------------------------------------------------------
+def show_chart(fig, name, **kwargs):
+    # st.plotly_chart, timed as its own profile section (figure serialisation).
+    # Figures are slimmed in place first (see payload.py); when profiling, the
+    # section also records the payload size before and after.
+    import streamlit as st
+
+    import payload
+    from instrumentation import section
+
+    with section(f"send chart: {name}") as sec:
+        if sec is not None:
+            sec.record["kb_before"] = round(payload.figure_bytes(fig) / 1024, 1)
+        if payload.is_enabled():
+            payload.slim_figure(fig)
+        if sec is not None:
+            sec.record["kb_after"] = round(payload.figure_bytes(fig) / 1024, 1)
+        st.plotly_chart(fig, use_container_width=True, **kwargs)
+
+
+# -------------------------------------------------------------------
+# FIGURE FACTORIES
+# -------------------------------------------------------------------
+@timed()
+def accent_bar(data, x, y, title, colour, **kwargs):
+    # Single-colour bar chart used across the TLG strands
+    import plotly.express as px
+
+    return px.bar(
+        data,
+        x=x,
+        y=y,
+        title=title,
+        color=x,
+        color_discrete_sequence=[colour],
+        **kwargs,
+    )
+
+
+@timed()
+def accelerator_map(accelerator_df, selected_accelerator):
+    import numpy as np
+    import plotly.express as px
+
+    map_df = accelerator_df.copy()
+    map_df["Selected"] = map_df["Accelerator"] == selected_accelerator
+    map_df["Marker_size"] = map_df["Selected"].map({True: 18, False: 10})
+    map_df["Type"] = np.where(
+        map_df["Selected"],
+        "Selected accelerator team",
+        "Other TLG accelerator sites",
+    )
+
+    fig_map = px.scatter_mapbox(
+        map_df,
+        lat="lat",
+        lon="lon",
+        hover_name="Place",
+        hover_data={
+            "Accelerator": True,
+            "Type": False,
+            "Marker_size": False,
+            "lat": False,
+            "lon": False,
+        },
+        color="Type",
+        size="Marker_size",
+        size_max=20,
+        zoom=5,
+        center={"lat": 53.5, "lon": -2.0},
+        mapbox_style="open-street-map",
+        color_discrete_map={
+            "Selected accelerator team": "#005F83",      # highlight
+            "Other TLG accelerator sites": "#7FB3D5",    # background sites
+        },
+    )
+
+    fig_map.update_layout(
+        margin={"r": 0, "t": 0, "l": 0, "b": 0},
+        height=400,
+        legend_title="",
+    )
+
+    # Custom hover note
+    fig_map.update_traces(
+        hovertemplate=(
+            "<b>%{hovertext}</b><br>"  # Place name
+            "%{customdata[0]}<br>"     # Accelerator name
+            "This accelerator team is located here.<extra></extra>"
+        )
+    )
+    return fig_map
+
+
+@timed()
+def likert_bar(percent, questions, likert_opts, palette, title):
+    # Horizontal stacked bar chart, ONS-style, one trace per response option.
+    # percent is a (question x option) array, e.g. a slice of the registry's
+    # Likert matrices (tlg_data.likert_matrices). Bars sit at integer positions
+    # labelled through the y-axis ticktext, so the long question strings are
+    # sent once rather than once per option; %{y} in hover shows the ticktext.
+    import numpy as np
+    import plotly.graph_objects as go
+
+    positions = np.arange(len(questions))
+    fig_likert = go.Figure(
+        [
+            go.Bar(
+                x=np.asarray(percent[:, j], dtype=np.float32),
+                y=positions,
+                name=option,
+                orientation="h",
+                marker_color=palette[j % len(palette)],
+                texttemplate="%{x:.0f}%",
+                textposition="inside",
+                insidetextanchor="middle",
+                textfont=dict(color="#FFFFFF", size=11),
+                hovertemplate="<b>%{y}</b><br>%{fullData.name}<br>%{x:.1f}%<extra></extra>",
+            )
+            for j, option in enumerate(likert_opts)
+        ]
+    )
+
+    fig_likert.update_layout(
+        **ons_layout(
+            title=title,
+            barmode="stack",
+            xaxis_title="Percent of respondents",
+            yaxis_title="",
+            xaxis=dict(
+                range=[0, 100],
+                ticks="outside",
+                tick0=0,
+                dtick=20,
+                showgrid=True,
+                gridcolor=GRID_GREY,
+                zeroline=False,
+            ),
+            # First question at the bottom, as plotly express laid it out
+            yaxis=dict(
+                showgrid=False,
+                zeroline=False,
+                tickmode="array",
+                tickvals=positions,
+                ticktext=list(questions),
+                range=[-0.5, len(questions) - 0.5],
+            ),
+            legend_title="Response",
+            legend_tracegroupgap=0,
+            bargap=0.25,
+            margin=dict(l=260, r=40, t=80, b=60),
+        )
+    )
+    return fig_likert
+
+
+@timed()
+def wave_dumbbell(changes, questions, wave_from, wave_to, title):
+    # Mean score per question in two waves, joined by a line; changes holds the
+    # precomputed survey_change.wave_changes rows for one accelerator, battery
+    # and wave pair. Questions whose mean moved significantly (p < 0.05) are
+    # drawn in the accent colour and flagged with an asterisk.
+    import numpy as np
+    import plotly.graph_objects as go
+
+    changes = changes.set_index("Question").loc[list(questions)]
+    mean_from = changes["Mean_from"].to_numpy()
+    mean_to = changes["Mean_to"].to_numpy()
+    significant = changes["p_value"].to_numpy() < 0.05
+    labels = [
+        f"{d:+.2f}{'*' if sig else ''}" for d, sig in zip(changes["Mean_diff"], significant)
+    ]
+    hover = (
+        "<b>%{y}</b><br>%{customdata[0]:.2f} → %{customdata[1]:.2f}"
+        "<br>Change %{customdata[2]:+.2f} ± %{customdata[3]:.2f} (p = %{customdata[4]:.3f})"
+        "<br>Distribution shift %{customdata[5]:.0f} ppts (χ² p = %{customdata[6]:.3f})"
+        "<extra>%{fullData.name}</extra>"
+    )
+    customdata = changes[
+        [
+            "Mean_from",
+            "Mean_to",
+            "Mean_diff",
+            "Mean_diff_ci",
+            "p_value",
+            "Distribution_shift",
+            "Chi2_p",
+        ]
+    ].to_numpy()
+
+    # One line trace for all questions, segments separated by gaps
+    line_x = np.column_stack([mean_from, mean_to, np.full(len(questions), np.nan)]).ravel()
+    line_y = np.repeat(np.asarray(questions, dtype=object), 3)
+
+    fig = go.Figure(
+        [
+            go.Scatter(
+                x=line_x,
+                y=line_y,
+                mode="lines",
+                line=dict(color=GRID_GREY, width=4),
+                hoverinfo="skip",
+                showlegend=False,
+            ),
+            go.Scatter(
+                x=mean_from,
+                y=questions,
+                mode="markers",
+                name=wave_from,
+                marker=dict(color=PRE_COLOUR, size=12),
+                customdata=customdata,
+                hovertemplate=hover,
+            ),
+            go.Scatter(
+                x=mean_to,
+                y=questions,
+                mode="markers+text",
+                name=wave_to,
+                marker=dict(
+                    color=np.where(significant, CURR_COLOUR, CURR_SHADE),
+                    line=dict(color=CURR_COLOUR, width=1.5),
+                    size=12,
+                ),
+                text=labels,
+                textposition=np.where(mean_to >= mean_from, "middle right", "middle left"),
+                textfont=dict(color=TEXT_GREY, size=11),
+                customdata=customdata,
+                hovertemplate=hover,
+            ),
+        ]
+    )
+    fig.update_layout(
+        **ons_layout(
+            title=title,
+            xaxis=dict(
+                title="Mean score (1–5, excluding don’t know)",
+                range=[0.75, 5.25],
+                dtick=1,
+                showgrid=True,
+                gridcolor=GRID_GREY,
+                zeroline=False,
+            ),
+            # First question at the bottom, matching likert_bar
+            yaxis=dict(showgrid=False, categoryorder="array", categoryarray=list(questions)),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, x=0),
+            margin=dict(l=260, r=40, t=80, b=60),
+        )
+    )
+    return fig
+
+
+@timed()
+def cooccurrence_heatmap(matrix, labels, title):
+    # Documents containing both codes; the diagonal is documents with each code
+    import plotly.graph_objects as go
+
+    fig = go.Figure(
+        go.Heatmap(
+            z=matrix.toarray(),
+            x=labels,
+            y=labels,
+            colorscale=[[0, "#FFFFFF"], [1, CURR_COLOUR]],
+            texttemplate="%{z}",
+            hovertemplate="<b>%{y}</b> and <b>%{x}</b><br>%{z} documents<extra></extra>",
+            colorbar=dict(title="Documents"),
+        )
+    )
+    fig.update_layout(
+        **ons_layout(
+            title=title,
+            height=520,
+            xaxis=dict(showgrid=False, tickangle=-30),
+            yaxis=dict(showgrid=False, autorange="reversed"),
+            margin=dict(l=180, r=40, t=80, b=120),
+        )
+    )
+    return fig
+
+
+def metric_figure(*args, **kwargs):
+    from kirklees_profile import make_metric_figure
+
+    return make_metric_figure(*args, **kwargs)
+
+
+def small_multiples(*args, **kwargs):
+    from kirklees_profile import make_small_multiples
+
+    return make_small_multiples(*args, **kwargs)
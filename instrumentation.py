@@ -0,0 +1,143 @@
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+# Per-rerun timing and allocation profile for the dashboards.
+#
+# Off by default. Turn it on with TLG_PROFILE=1 or by adding ?profile=1 to the
+# app URL. When off, `section()` hands back a shared no-op context manager and
+# `timed()` adds one attribute lookup per call.
+#
+# Each Streamlit session runs its script in its own thread, so records are kept
+# per thread. Allocation figures come from tracemalloc, which is process-wide
+# and slows every allocation in every session, so it is only started by the
+# TLG_PROFILE=1 environment flag; ?profile=1 alone records timings. Even then
+# allocation figures are only meaningful while a single session is rerunning.
+
+ENV_FLAG = "TLG_PROFILE"
+HISTORY_LENGTH = 50
+
+_NULL = contextlib.nullcontext()
+_local = threading.local()
+
+
+def _state():
+    state = getattr(_local, "state", None)
+    if state is None:
+        state = _local.state = {"enabled": False, "records": [], "stack": [], "start": 0.0}
+    return state
+
+
+def is_enabled():
+    return _state()["enabled"]
+
+
+def start_rerun():
+    # Call at the top of the app script; decides whether this rerun is profiled
+    import streamlit as st
+
+    state = _state()
+    env_enabled = os.environ.get(ENV_FLAG) == "1"
+    state["enabled"] = env_enabled or st.query_params.get("profile") == "1"
+    state["records"], state["stack"] = [], []
+    state["start"] = time.perf_counter()
+    if env_enabled and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+class _Section:
+    __slots__ = ("state", "record", "t0", "mem0", "child_peak", "tracing")
+
+    def __init__(self, name, state):
+        self.state = state
+        # Appended on entry so records read in start order, nested under parents
+        self.record = {"section": name, "depth": len(state["stack"])}
+
+    def __enter__(self):
+        self.child_peak = 0
+        self.tracing = tracemalloc.is_tracing()
+        if self.tracing:
+            self.mem0 = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self.state["stack"].append(self)
+        self.state["records"].append(self.record)
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.t0
+        stack = self.state["stack"]
+        stack.pop()
+        self.record["ms"] = round(elapsed * 1000, 2)
+        if self.tracing and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, self.child_peak)
+            if stack:
+                stack[-1].child_peak = max(stack[-1].child_peak, peak)
+            self.record.update(
+                net_kb=round((current - self.mem0) / 1024, 1),
+                peak_kb=round((peak - self.mem0) / 1024, 1),
+            )
+        return False
+
+
+def section(name):
+    state = _state()
+    if not state["enabled"]:
+        return _NULL
+    return _Section(name, state)
+
+
+def timed(name=None):
+    # Decorator form of `section`, e.g. @timed() on a figure factory
+    def decorate(func):
+        label = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            state = _state()
+            if not state["enabled"]:
+                return func(*args, **kwargs)
+            with _Section(label, state):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def render_debug_panel():
+    # Call at the end of the app script: sidebar table plus JSON export
+    state = _state()
+    if not state["enabled"]:
+        return
+    import streamlit as st
+
+    total_ms = (time.perf_counter() - state["start"]) * 1000
+    profile = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "total_ms": round(total_ms, 1),
+        "sections": state["records"],
+    }
+    history = st.session_state.setdefault("_profile_history", [])
+    history.append(profile)
+    del history[:-HISTORY_LENGTH]
+
+    with st.sidebar.expander(f"⏱ Profile – rerun took {total_ms:,.0f} ms", expanded=True):
+        st.dataframe(
+            [
+                {**r, "section": "  " * r["depth"] + r["section"]}
+                for r in state["records"]
+            ],
+            hide_index=True,
+        )
+        st.download_button(
+            "Export profile (JSON)",
+            json.dumps(history, indent=2),
+            file_name="dashboard_profile.json",
+            mime="application/json",
+        )
@@ -1,176 +1,33 @@
-import streamlit as st
-import pandas as pd
-import plotly.graph_objects as go
-
-# ---------------------------------------------------------
-# PAGE CONFIG
-# ---------------------------------------------------------
-st.set_page_config(
-    page_title="Kirklees - Labour Market Profile",
-    layout="wide",
-    page_icon="📈",
-)
+import os
 
-# ---------------------------------------------------------
-# DATA
-# ---------------------------------------------------------
-periods = [
-    "2015-16",
-    "2016-17",
-    "2017-18",
-    "2018-19",
-    "2019-20",
-    "2020-21",
-    "2021-22",
-    "2022-23",
-    "2023-24",
-    "2024-25",
-]
-
-employment_pct = [70.0, 70.7, 70.5, 71.9, 73.6, 69.9, 73.7, 72.7, 74.1, 76.4]
-employment_ci  = [3.1,  3.0,  3.0,  2.8,  3.0,  3.4,  3.4,  3.9,  4.0,  3.2]
-
-unemp_pct = [5.1, 6.4, 4.5, 4.1, 1.8, 5.9, 2.3, 4.8, 3.3, 5.1]
-unemp_ci  = [1.7, 1.9, 1.6, 1.5, 1.0, 2.0, 1.3, 2.2, 1.9, 1.8]
-
-inact_pct = [26.2, 24.4, 26.2, 25.0, 25.0, 25.7, 24.6, 23.6, 23.3, 19.5]
-inact_ci  = [3.0,  2.9,  2.9,  2.7,  3.0,  3.3,  3.3,  3.8,  3.9,  3.0]
+import streamlit as st
 
-df = pd.DataFrame(
-    {
-        "Period": periods,
-        "Employment_pct": employment_pct,
-        "Employment_ci": employment_ci,
-        "Unemp_pct": unemp_pct,
-        "Unemp_ci": unemp_ci,
-        "Inact_pct": inact_pct,
-        "Inact_ci": inact_ci,
-    }
+from dashboard_core import (
+    configure_page,
+    load_area_profiles,
+    load_dummy_profiles,
+    load_forecasts,
+    load_kirklees_profile,
+    load_period_tests,
+    metric_figure,
+    show_chart,
+    small_multiples,
 )
+from instrumentation import render_debug_panel, section, start_rerun
+from kirklees_profile import FULL_RANGE, METRICS, significance_annotation
 
-# Split point: 2021–22 (KBOP starts)
-split_period = "2021-22"
-split_idx = df.index[df["Period"] == split_period][0]
-
-# ONS colours
-PRE_COLOUR = "#959495"   # Vintage grey
-CURR_COLOUR = "#206095"  # Ocean blue
-PRE_SHADE = "rgba(149,148,149,0.25)"
-CURR_SHADE = "rgba(32,96,149,0.25)"
+# Comparison-view areas when no CSV is uploaded: the profiles CSV named by
+# KIRKLEES_PROFILES (same layout as an upload), otherwise dummy areas
+PROFILES_PATH = os.environ.get("KIRKLEES_PROFILES")
+N_DUMMY_AREAS = 30
 
 # ---------------------------------------------------------
-# FIGURE FACTORY
+# PAGE CONFIG
 # ---------------------------------------------------------
-def make_metric_figure(df, value_col, ci_col, title, y_min, y_max):
-
-    fig = go.Figure()
-
-    # CI bounds
-    ci_low = df[value_col] - df[ci_col]
-    ci_high = df[value_col] + df[ci_col]
-
-    pre = df.iloc[: split_idx + 1]
-    curr = df.iloc[split_idx:]
-
-    pre_low = ci_low.iloc[: split_idx + 1]
-    pre_high = ci_high.iloc[: split_idx + 1]
-    curr_low = ci_low.iloc[split_idx:]
-    curr_high = ci_high.iloc[split_idx:]
+configure_page("Kirklees - Labour Market Profile", "📈")
 
-    # ---------- CI bands ----------
-    fig.add_trace(
-        go.Scatter(
-            x=list(pre["Period"]) + list(pre["Period"][::-1]),
-            y=list(pre_low) + list(pre_high[::-1]),
-            mode="lines",
-            marker=dict(size=0),
-            fill="toself",
-            fillcolor=PRE_SHADE,
-            line=dict(width=0),
-            hoverinfo="skip",
-            showlegend=False,
-        )
-    )
-
-    fig.add_trace(
-        go.Scatter(
-            x=list(curr["Period"]) + list(curr["Period"][::-1]),
-            y=list(curr_low) + list(curr_high[::-1]),
-            mode="lines",
-            marker=dict(size=0),
-            fill="toself",
-            fillcolor=CURR_SHADE,
-            line=dict(width=0),
-            hoverinfo="skip",
-            showlegend=False,
-        )
-    )
-
-    # ---------- Lines ----------
-    fig.add_trace(
-        go.Scatter(
-            x=pre["Period"],
-            y=pre[value_col],
-            mode="lines",
-            marker=dict(size=0),
-            line=dict(color=PRE_COLOUR, width=3),
-            name="Pre-KBOP period (2015–16 to 2020–21)",
-        )
-    )
-
-    fig.add_trace(
-        go.Scatter(
-            x=curr["Period"],
-            y=curr[value_col],
-            mode="lines",
-            marker=dict(size=0),
-            line=dict(color=CURR_COLOUR, width=3),
-            name="KBOP period (2021–22 to 2024–25)",
-        )
-    )
-
-    # ---------- Average dashed line ----------
-    avg_val = df[value_col].mean()
-    fig.add_hline(
-        y=avg_val,
-        line_dash="dash",
-        line_color="#595959",
-        annotation_text=f"Average: {avg_val:.1f}%",
-        annotation_position="top left",
-        annotation_font=dict(size=11, color="#595959"),
-    )
-
-    # ---------- Layout ----------
-    fig.update_layout(
-        title=title,
-        title_x=0.0,
-        margin=dict(l=60, r=40, t=60, b=80),
-        plot_bgcolor="#FFFFFF",
-        paper_bgcolor="#FFFFFF",
-        xaxis=dict(
-            title="Time period",
-            tickmode="array",
-            tickvals=df["Period"],
-            ticktext=df["Period"],
-            tickangle=45,
-            showgrid=False,
-        ),
-        yaxis=dict(
-            title="Percent of working-age population",
-            range=[y_min, y_max],
-            showgrid=True,
-            gridcolor="#E5E5E5",
-        ),
-        legend=dict(
-            orientation="v",
-            yanchor="top",
-            y=1.0,
-            xanchor="left",
-            x=1.02,
-        ),
-    )
-
-    return fig
+# Optional per-section profile (TLG_PROFILE=1 or ?profile=1)
+start_rerun()
 
 # ---------------------------------------------------------
 # PAGE CONTENT
@@ -189,60 +46,84 @@ zoom_all = st.checkbox(
     "Use zoomed y-axis for each chart (otherwise 0–100%)", value=True
 )
 
-if zoom_all:
-    # Tight, metric-specific ranges
-    emp_range = (60, 80)
-    unemp_range = (0, 10)
-    inact_range = (15, 30)
-else:
-    # Common 0–100% range
-    emp_range = (0, 100)
-    unemp_range = (0, 100)
-    inact_range = (0, 100)
+# Trend projection beyond the latest APS period
+show_projection = st.checkbox("Show projection for the next two periods", value=False)
 
-# Employment
-st.plotly_chart(
-    make_metric_figure(
-        df,
-        "Employment_pct",
-        "Employment_ci",
-        "Employment rate (16–64)",
-        emp_range[0],
-        emp_range[1],
-    ),
-    use_container_width=True,
-)
+view = st.radio("View", ["Kirklees profile", "Compare areas"], horizontal=True)
 
-# Unemployment
-st.plotly_chart(
-    make_metric_figure(
-        df,
-        "Unemp_pct",
-        "Unemp_ci",
-        "Unemployment rate (16–64)",
-        unemp_range[0],
-        unemp_range[1],
-    ),
-    use_container_width=True,
-)
+# ---------------------------------------------------------
+# COMPARISON VIEW (SMALL MULTIPLES)
+# ---------------------------------------------------------
+if view == "Compare areas":
+    uploaded = st.file_uploader(
+        "Area profiles CSV (Area, Period and metric columns as in the Kirklees data)",
+        type="csv",
+    )
+    with section("profile data"):
+        if uploaded is not None or PROFILES_PATH:
+            try:
+                profiles = load_area_profiles(uploaded if uploaded is not None else PROFILES_PATH)
+            except ValueError as exc:
+                st.error(str(exc))
+                st.stop()
+        else:
+            st.caption("No file uploaded – showing Kirklees alongside dummy neighbouring areas.")
+            profiles = load_dummy_profiles(N_DUMMY_AREAS)
+
+    all_areas = list(dict.fromkeys(profiles["Area"]))
+    selected_areas = st.multiselect("Areas", all_areas, default=all_areas[:40])
+    metric = st.selectbox("Metric", METRICS, format_func=lambda m: m["title"])
+
+    if selected_areas:
+        y_min, y_max = metric["zoom_range"] if zoom_all else FULL_RANGE
+        fig = small_multiples(
+            profiles[profiles["Area"].isin(selected_areas)],
+            metric["value_col"],
+            metric["ci_col"],
+            metric["title"],
+            y_min,
+            y_max,
+        )
+        show_chart(fig, "small multiples")
 
-# Economic inactivity
-st.plotly_chart(
-    make_metric_figure(
-        df,
-        "Inact_pct",
-        "Inact_ci",
-        "Economic inactivity rate (16–64)",
-        inact_range[0],
-        inact_range[1],
-    ),
-    use_container_width=True,
-)
+else:
+    # Single-area Kirklees profile, annotated with KBOP vs pre-KBOP tests.
+    # pandas / plotly are first imported here, after the header has painted.
+    with section("profile data"):
+        profile = load_kirklees_profile()
+    with section("significance tests"):
+        tests = load_period_tests(profile)
+    with section("projection"):
+        forecasts = load_forecasts(profile, 2) if show_projection else None
+    for metric in METRICS:
+        y_min, y_max = metric["zoom_range"] if zoom_all else FULL_RANGE
+        fig = metric_figure(
+            profile,
+            metric["value_col"],
+            metric["ci_col"],
+            metric["title"],
+            y_min,
+            y_max,
+            annotation=significance_annotation(tests.loc[("Kirklees", metric["key"])]),
+            forecast=(
+                forecasts[forecasts["Metric"] == metric["key"]]
+                if show_projection
+                else None
+            ),
+        )
+        show_chart(fig, metric["key"])
 
 st.markdown(
     """
 **Source:** ONS Annual Population Survey (APS), Kirklees residents aged 16–64.  
 Confidence intervals shown at the 95% level.  
+KBOP vs pre-KBOP differences use the published CIs as standard errors; the changepoint
+scan p-value is Bonferroni-adjusted over all candidate split periods.  
+Projections use a local linear trend model weighted by each year's CI width; the shaded
+band is the 95% interval for the underlying rate.  
 Visual style informed by the ONS design guidance.
 """
 )
+
+# Debug sidebar panel (only when profiling is on)
+render_debug_panel()
@@ -0,0 +1,448 @@
+from dashboard_core import (
+    CURR_COLOUR,
+    CURR_SHADE,
+    FORECAST_COLOUR,
+    FORECAST_SHADE,
+    GRID_GREY,
+    PRE_COLOUR,
+    PRE_SHADE,
+    TEXT_GREY,
+    ons_layout,
+)
+from instrumentation import timed
+
+# pandas, numpy and plotly are imported inside the functions below so the
+# dashboard can import the metric definitions before its first paint
+
+# ---------------------------------------------------------
+# DATA
+# ---------------------------------------------------------
+periods = [
+    "2015-16",
+    "2016-17",
+    "2017-18",
+    "2018-19",
+    "2019-20",
+    "2020-21",
+    "2021-22",
+    "2022-23",
+    "2023-24",
+    "2024-25",
+]
+
+employment_pct = [70.0, 70.7, 70.5, 71.9, 73.6, 69.9, 73.7, 72.7, 74.1, 76.4]
+employment_ci  = [3.1,  3.0,  3.0,  2.8,  3.0,  3.4,  3.4,  3.9,  4.0,  3.2]
+
+unemp_pct = [5.1, 6.4, 4.5, 4.1, 1.8, 5.9, 2.3, 4.8, 3.3, 5.1]
+unemp_ci  = [1.7, 1.9, 1.6, 1.5, 1.0, 2.0, 1.3, 2.2, 1.9, 1.8]
+
+inact_pct = [26.2, 24.4, 26.2, 25.0, 25.0, 25.7, 24.6, 23.6, 23.3, 19.5]
+inact_ci  = [3.0,  2.9,  2.9,  2.7,  3.0,  3.3,  3.3,  3.8,  3.9,  3.0]
+
+
+def kirklees_frame():
+    import pandas as pd
+
+    return pd.DataFrame(
+        {
+            "Period": periods,
+            "Employment_pct": employment_pct,
+            "Employment_ci": employment_ci,
+            "Unemp_pct": unemp_pct,
+            "Unemp_ci": unemp_ci,
+            "Inact_pct": inact_pct,
+            "Inact_ci": inact_ci,
+        }
+    )
+
+
+# Split point: 2021–22 (KBOP starts)
+split_period = "2021-22"
+# Fewest periods either side of a candidate changepoint (profile_stats.period_tests)
+MIN_SEGMENT_PERIODS = 2
+
+# One entry per chart: value/CI columns, title and zoomed y-axis range
+METRICS = [
+    {
+        "key": "employment",
+        "value_col": "Employment_pct",
+        "ci_col": "Employment_ci",
+        "title": "Employment rate (16–64)",
+        "zoom_range": (60, 80),
+    },
+    {
+        "key": "unemployment",
+        "value_col": "Unemp_pct",
+        "ci_col": "Unemp_ci",
+        "title": "Unemployment rate (16–64)",
+        "zoom_range": (0, 10),
+    },
+    {
+        "key": "inactivity",
+        "value_col": "Inact_pct",
+        "ci_col": "Inact_ci",
+        "title": "Economic inactivity rate (16–64)",
+        "zoom_range": (15, 30),
+    },
+]
+FULL_RANGE = (0, 100)
+
+# ---------------------------------------------------------
+# MULTI-AREA PROFILES
+# ---------------------------------------------------------
+# Long format: one row per Area x Period with the same metric columns as kirklees_frame()
+PROFILE_COLUMNS = ["Area", "Period"] + [
+    col for m in METRICS for col in (m["value_col"], m["ci_col"])
+]
+
+
+def load_area_profiles(path):
+    import pandas as pd
+
+    profiles = pd.read_csv(path, dtype={"Area": str, "Period": str})
+    name = getattr(path, "name", path)
+    missing = [col for col in PROFILE_COLUMNS if col not in profiles.columns]
+    if missing:
+        raise ValueError(f"{name} is missing columns: {', '.join(missing)}")
+
+    duplicated = profiles.duplicated(["Area", "Period"])
+    if duplicated.any():
+        first = profiles[duplicated].iloc[0]
+        raise ValueError(
+            f"{name} has {duplicated.sum()} duplicate Area/Period rows, "
+            f"e.g. {first['Area']} {first['Period']}"
+        )
+
+    # The KBOP tests and charts split every profile at split_period
+    period_list = list(dict.fromkeys(profiles["Period"]))
+    if split_period not in period_list:
+        raise ValueError(f"{name} has no {split_period} period (the KBOP start)")
+    if period_list.index(split_period) == 0:
+        raise ValueError(f"{name} needs at least one period before {split_period}")
+    if len(period_list) < 2 * MIN_SEGMENT_PERIODS:
+        raise ValueError(
+            f"{name} has {len(period_list)} periods; at least {2 * MIN_SEGMENT_PERIODS} are needed"
+        )
+    return profiles[PROFILE_COLUMNS]
+
+
+def dummy_area_profiles(n_areas, seed=42):
+    # Kirklees plus (n_areas - 1) jittered copies, for demos and load tests
+    import numpy as np
+    import pandas as pd
+
+    df = kirklees_frame()
+    rng = np.random.default_rng(seed)
+    frames = [df.assign(Area="Kirklees")]
+    for i in range(1, n_areas):
+        area = df.copy()
+        area["Area"] = f"Area {i:03d}"
+        for m in METRICS:
+            shift = rng.normal(0, 2.0)
+            noise = rng.normal(0, 1.0, len(area))
+            area[m["value_col"]] = (area[m["value_col"]] + shift + noise).clip(0, 100).round(1)
+            area[m["ci_col"]] = (area[m["ci_col"]] * rng.uniform(0.7, 1.4)).round(1)
+        frames.append(area)
+    return pd.concat(frames, ignore_index=True)[PROFILE_COLUMNS]
+
+
+# ---------------------------------------------------------
+# FIGURE FACTORY
+# ---------------------------------------------------------
+def _period_label(period):
+    return period.replace("-", "–")
+
+
+def significance_annotation(test):
+    # Short text block for one row of profile_stats.period_tests
+    diff, ci = test["Diff"], test["Diff_ci"]
+    text = (
+        f"<b>KBOP vs pre-KBOP: {diff:+.1f} ppts</b><br>"
+        f"95% CI {diff - ci:+.1f} to {diff + ci:+.1f}, p = {test['p_value']:.3f}"
+    )
+    if test["Changepoint_period"] is None:
+        return text
+    return (
+        f"{text}<br>Largest shift from {_period_label(test['Changepoint_period'])} "
+        f"({test['Changepoint_diff']:+.1f} ppts, adj. p = {test['Changepoint_p_adj']:.3f})"
+    )
+
+
+@timed()
+def make_metric_figure(
+    df,
+    value_col,
+    ci_col,
+    title,
+    y_min,
+    y_max,
+    split_period=split_period,
+    annotation=None,
+    forecast=None,
+):
+    import numpy as np
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+
+    df = df.reset_index(drop=True)
+    split_idx = df.index[df["Period"] == split_period][0]
+    # Traces use integer x positions; the period labels are sent once, as the
+    # x-axis ticktext, which hover labels (%{x}) also show
+    pos = np.arange(len(df))
+
+    # CI bounds
+    ci_low = df[value_col] - df[ci_col]
+    ci_high = df[value_col] + df[ci_col]
+
+    pre = df.iloc[: split_idx + 1]
+    curr = df.iloc[split_idx:]
+    pre_x = pos[: split_idx + 1]
+    curr_x = pos[split_idx:]
+
+    pre_low = ci_low.iloc[: split_idx + 1]
+    pre_high = ci_high.iloc[: split_idx + 1]
+    curr_low = ci_low.iloc[split_idx:]
+    curr_high = ci_high.iloc[split_idx:]
+
+    pre_name = (
+        f"Pre-KBOP period ({_period_label(df['Period'].iloc[0])} "
+        f"to {_period_label(df['Period'].iloc[split_idx - 1])})"
+    )
+    curr_name = (
+        f"KBOP period ({_period_label(split_period)} "
+        f"to {_period_label(df['Period'].iloc[-1])})"
+    )
+
+    # ---------- CI bands ----------
+    fig.add_trace(
+        go.Scatter(
+            x=np.concatenate([pre_x, pre_x[::-1]]),
+            y=np.concatenate([pre_low, pre_high[::-1]]),
+            mode="lines",
+            marker=dict(size=0),
+            fill="toself",
+            fillcolor=PRE_SHADE,
+            line=dict(width=0),
+            hoverinfo="skip",
+            showlegend=False,
+        )
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=np.concatenate([curr_x, curr_x[::-1]]),
+            y=np.concatenate([curr_low, curr_high[::-1]]),
+            mode="lines",
+            marker=dict(size=0),
+            fill="toself",
+            fillcolor=CURR_SHADE,
+            line=dict(width=0),
+            hoverinfo="skip",
+            showlegend=False,
+        )
+    )
+
+    # ---------- Lines ----------
+    fig.add_trace(
+        go.Scatter(
+            x=pre_x,
+            y=pre[value_col],
+            mode="lines",
+            marker=dict(size=0),
+            line=dict(color=PRE_COLOUR, width=3),
+            name=pre_name,
+        )
+    )
+
+    fig.add_trace(
+        go.Scatter(
+            x=curr_x,
+            y=curr[value_col],
+            mode="lines",
+            marker=dict(size=0),
+            line=dict(color=CURR_COLOUR, width=3),
+            name=curr_name,
+        )
+    )
+
+    # ---------- Projection (see profile_forecast) ----------
+    # Starts from the last observed point so the segment joins the KBOP line
+    if forecast is not None and len(forecast):
+        last = df.iloc[-1]
+        fc_x = np.arange(len(df) - 1, len(df) + len(forecast))
+        fc_low = [last[value_col]] + list(forecast["Low"])
+        fc_high = [last[value_col]] + list(forecast["High"])
+        fig.add_trace(
+            go.Scatter(
+                x=np.concatenate([fc_x, fc_x[::-1]]),
+                y=fc_low + fc_high[::-1],
+                mode="lines",
+                fill="toself",
+                fillcolor=FORECAST_SHADE,
+                line=dict(width=0),
+                hoverinfo="skip",
+                showlegend=False,
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=fc_x,
+                y=[last[value_col]] + list(forecast["Forecast"]),
+                mode="lines",
+                line=dict(color=FORECAST_COLOUR, width=3, dash="dot"),
+                name=(
+                    f"Projection ({_period_label(forecast['Period'].iloc[0])} "
+                    f"to {_period_label(forecast['Period'].iloc[-1])})"
+                ),
+            )
+        )
+
+    # ---------- Average dashed line ----------
+    avg_val = df[value_col].mean()
+    fig.add_hline(
+        y=avg_val,
+        line_dash="dash",
+        line_color=TEXT_GREY,
+        annotation_text=f"Average: {avg_val:.1f}%",
+        annotation_position="top left",
+        annotation_font=dict(size=11, color=TEXT_GREY),
+    )
+
+    # ---------- Significance note (see profile_stats) ----------
+    if annotation:
+        fig.add_annotation(
+            text=annotation,
+            xref="paper",
+            yref="paper",
+            x=1.02,
+            y=0.0,
+            xanchor="left",
+            yanchor="bottom",
+            align="left",
+            showarrow=False,
+            font=dict(size=11, color=TEXT_GREY),
+        )
+
+    # ---------- Layout ----------
+    all_periods = list(df["Period"])
+    if forecast is not None:
+        all_periods += list(forecast["Period"])
+    fig.update_layout(
+        **ons_layout(
+            title=title,
+            title_x=0.0,
+            margin=dict(l=60, r=40, t=60, b=80),
+            xaxis=dict(
+                title="Time period",
+                tickmode="array",
+                tickvals=np.arange(len(all_periods)),
+                ticktext=all_periods,
+                tickangle=45,
+                showgrid=False,
+            ),
+            yaxis=dict(
+                title="Percent of working-age population",
+                range=[y_min, y_max],
+                showgrid=True,
+                gridcolor=GRID_GREY,
+            ),
+            legend=dict(
+                orientation="v",
+                yanchor="top",
+                y=1.0,
+                xanchor="left",
+                x=1.02,
+            ),
+        )
+    )
+
+    return fig
+
+
+@timed()
+def make_small_multiples(
+    profiles, value_col, ci_col, title, y_min, y_max, n_cols=5, split_period=split_period
+):
+    # One subplot per area in a single figure, so the browser gets one payload
+    # and one WebGL context instead of one chart per area
+    import numpy as np
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+
+    areas = list(dict.fromkeys(profiles["Area"]))
+    period_list = list(dict.fromkeys(profiles["Period"]))
+    split_idx = period_list.index(split_period)
+
+    values = profiles.pivot(index="Area", columns="Period", values=value_col)
+    values = values.loc[areas, period_list].to_numpy()
+    cis = profiles.pivot(index="Area", columns="Period", values=ci_col)
+    cis = cis.loc[areas, period_list].to_numpy()
+    # float32 keeps far more precision than the 1 dp shown and halves the payload
+    values, lows, highs = (a.astype(np.float32) for a in (values, values - cis, values + cis))
+
+    n_rows = -(-len(areas) // n_cols)
+    fig = make_subplots(
+        rows=n_rows,
+        cols=n_cols,
+        shared_xaxes="all",
+        shared_yaxes="all",
+        subplot_titles=areas,
+        horizontal_spacing=0.02,
+        vertical_spacing=0.25 / n_rows,
+    )
+
+    segments = [
+        (slice(None, split_idx + 1), PRE_COLOUR, PRE_SHADE),
+        (slice(split_idx, None), CURR_COLOUR, CURR_SHADE),
+    ]
+    # Integer x positions, labelled with the periods through the shared ticktext
+    pos = np.arange(len(period_list))
+    for i, area in enumerate(areas):
+        row, col = divmod(i, n_cols)
+        for seg, colour, shade in segments:
+            x = pos[seg]
+            fig.add_trace(
+                go.Scattergl(
+                    x=np.concatenate([x, x[::-1]]),
+                    y=np.concatenate([lows[i, seg], highs[i, seg][::-1]]),
+                    mode="lines",
+                    fill="toself",
+                    fillcolor=shade,
+                    line=dict(width=0),
+                    hoverinfo="skip",
+                    showlegend=False,
+                ),
+                row=row + 1,
+                col=col + 1,
+            )
+            fig.add_trace(
+                go.Scattergl(
+                    x=x,
+                    y=values[i, seg],
+                    mode="lines",
+                    line=dict(color=colour, width=2),
+                    name=area,
+                    hovertemplate="%{x}: %{y:.1f}%<extra>" + area + "</extra>",
+                    showlegend=False,
+                ),
+                row=row + 1,
+                col=col + 1,
+            )
+
+    fig.update_annotations(font_size=11)
+    fig.update_xaxes(
+        showticklabels=False, showgrid=False, tickmode="array", tickvals=pos, ticktext=period_list
+    )
+    fig.update_xaxes(showticklabels=True, tickangle=45, tickfont_size=9, row=n_rows)
+    fig.update_yaxes(range=[y_min, y_max], showgrid=True, gridcolor=GRID_GREY)
+    fig.update_layout(
+        title=title,
+        title_x=0.0,
+        height=max(300, 160 * n_rows),
+        margin=dict(l=40, r=20, t=80, b=20),
+        plot_bgcolor="#FFFFFF",
+        paper_bgcolor="#FFFFFF",
+    )
+
+    return fig
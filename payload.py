@@ -0,0 +1,177 @@
+import os
+import re
+
+# Payload slimming for Plotly figures sent to the browser.
+#
+# st.plotly_chart ships every figure as JSON on each rerun. slim_figure()
+# trims a figure in place so it renders the same from fewer bytes:
+#   - the template keeps only the trace-type and subplot defaults the figure
+#     uses. Streamlit's Plotly template carries defaults for every trace type
+#     (colorscales for heatmaps, contours, surfaces, ...) and for polar,
+#     ternary, 3-D and geo subplots: about 5 of the 7 kB it adds to each chart;
+#   - with TLG_SLIM_PAYLOAD=traces, each trace is also rewritten: numeric
+#     arrays become rounded NumPy arrays in the smallest safe dtype (base64
+#     typed arrays in Plotly >= 6), hover fields no hover label uses are
+#     dropped, and redundant legend/offset groups and tick text are removed.
+#     This costs 0.5-1 ms per trace, so it is opt-in; the figure factories
+#     already build compact arrays and label categories once through axis
+#     ticktext (see likert_bar and kirklees_profile).
+#
+# The template pass is on by default; set TLG_SLIM_PAYLOAD=0 to send figures
+# untouched.
+
+ENV_FLAG = "TLG_SLIM_PAYLOAD"
+DECIMALS = 4
+
+# Template layout sections that only apply to subplots of these trace types
+_SUBPLOT_TRACES = {
+    "polar": ("scatterpolar", "scatterpolargl", "barpolar"),
+    "ternary": ("scatterternary",),
+    "scene": ("scatter3d", "surface", "mesh3d", "cone", "streamtube", "isosurface", "volume"),
+    "geo": ("scattergeo", "choropleth"),
+    "mapbox": ("scattermapbox", "choroplethmapbox", "densitymapbox"),
+}
+
+# Trace attributes holding per-point numeric data
+_NUMERIC_KEYS = ("x", "y", "z", "lat", "lon", "customdata")
+_NESTED_NUMERIC_KEYS = (("marker", "size"),)
+_CUSTOMDATA_REF = re.compile(r"customdata\[(\d+)\]")
+
+
+def is_enabled():
+    return os.environ.get(ENV_FLAG, "1") != "0"
+
+
+def _slim_traces():
+    return os.environ.get(ENV_FLAG) == "traces"
+
+
+def figure_bytes(fig):
+    import plotly.io as pio
+
+    return len(pio.to_json(fig, validate=False).encode("utf-8"))
+
+
+def _typed_array(values, decimals):
+    # Rounded NumPy array in the smallest dtype that keeps `decimals` places,
+    # or None if the values are not all numeric
+    import numpy as np
+
+    try:
+        arr = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        return None
+    if arr.size == 0 or not np.isfinite(arr).all():
+        return None
+    arr = np.round(arr, decimals)
+    max_abs = np.abs(arr).max()
+    if np.array_equal(arr, np.trunc(arr)):
+        for dtype in (np.int8, np.int16, np.int32):
+            if max_abs <= np.iinfo(dtype).max:
+                return arr.astype(dtype)
+    # float32 carries ~7 significant digits
+    if max_abs < 10 ** (7 - decimals):
+        return arr.astype(np.float32)
+    return arr
+
+
+def _strip_hover(trace):
+    template = trace.hovertemplate
+    if isinstance(template, (list, tuple)):
+        return
+    if trace.hoverinfo in ("skip", "none"):
+        # No hover label at all: nothing below is ever displayed
+        trace.hovertemplate = None
+        template = ""
+    if template is None:
+        return
+
+    if trace.hovertext is not None and "hovertext" not in template:
+        trace.hovertext = None
+
+    if trace.customdata is not None:
+        used = template + (trace.texttemplate if isinstance(trace.texttemplate, str) else "")
+        refs = _CUSTOMDATA_REF.findall(used)
+        if "%{customdata}" in used:
+            return
+        if not refs:
+            trace.customdata = None
+            return
+        import numpy as np
+
+        data = np.asarray(trace.customdata, dtype=object)
+        if data.ndim == 2:
+            trace.customdata = data[:, : max(int(i) for i in refs) + 1]
+
+
+def _drop_redundant_groups(trace, barmode):
+    template = trace.hovertemplate if isinstance(trace.hovertemplate, str) else ""
+    if trace.legendgroup is not None and trace.legendgroup == trace.name:
+        if "legendgroup" not in template:
+            trace.legendgroup = None
+    # Offset/alignment groups only matter when bars are placed side by side
+    if barmode in ("stack", "relative", "overlay"):
+        for key in ("offsetgroup", "alignmentgroup"):
+            if key in trace and trace[key] is not None:
+                trace[key] = None
+
+
+def _replace(obj, key, value):
+    # Plotly ignores assignments equal to the current value, which would keep
+    # the original list/float64 array, so clear the property first
+    obj[key] = None
+    obj[key] = value
+
+
+def _typed_trace(trace, decimals):
+    for key in _NUMERIC_KEYS:
+        if key in trace and trace[key] is not None and not isinstance(trace[key], str):
+            arr = _typed_array(trace[key], decimals)
+            if arr is not None:
+                _replace(trace, key, arr)
+    for parent, key in _NESTED_NUMERIC_KEYS:
+        if parent in trace and key in trace[parent]:
+            values = trace[parent][key]
+            if values is not None and not isinstance(values, (int, float)):
+                arr = _typed_array(values, decimals)
+                if arr is not None:
+                    _replace(trace[parent], key, arr)
+
+
+def _dedupe_ticks(layout):
+    for name in layout:
+        if not name.startswith(("xaxis", "yaxis")):
+            continue
+        axis = layout[name]
+        if axis.tickvals is not None and axis.ticktext is not None:
+            if list(axis.tickvals) == list(axis.ticktext):
+                axis.ticktext = None
+
+
+def _prune_template(fig):
+    # Edited as a plain dict and assigned back in one go: setting the unused
+    # entries to None one by one through Plotly's validators is several times slower
+    types = {trace.type for trace in fig.data}
+    template = fig.layout.template.to_plotly_json()
+    template["data"] = {k: v for k, v in template.get("data", {}).items() if k in types}
+    for name, owners in _SUBPLOT_TRACES.items():
+        if not types.intersection(owners):
+            template.get("layout", {}).pop(name, None)
+    _replace(fig.layout, "template", template)
+
+
+def slim_figure(fig, decimals=DECIMALS, traces=None):
+    # Slims `fig` in place and returns it; figures are built fresh on every
+    # rerun, so there is no need to pay for a copy
+    if fig.layout.template is not None:
+        _prune_template(fig)
+    if traces is None:
+        traces = _slim_traces()
+    if traces:
+        barmode = fig.layout.barmode
+        for trace in fig.data:
+            _strip_hover(trace)
+            _drop_redundant_groups(trace, barmode)
+            _typed_trace(trace, decimals)
+        _dedupe_ticks(fig.layout)
+    return fig
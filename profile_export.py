@@ -0,0 +1,235 @@
+"""Batch static export of labour market profiles.
+
+Renders every area x metric with `make_metric_figure` across a process pool and
+writes PNG/SVG/HTML files to <out>/<area>/<metric>.<format>. Inputs are hashed
+so unchanged areas are skipped on the next run.
+
+    python profile_export.py --profiles profiles.csv --out exports
+    python profile_export.py --dummy-areas 300 --formats html --workers 8
+
+PNG/SVG export uses Kaleido, which needs Chrome; run `plotly_get_chrome` once
+to install it.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from kirklees_profile import (
+    FULL_RANGE,
+    METRICS,
+    dummy_area_profiles,
+    load_area_profiles,
+    make_metric_figure,
+    significance_annotation,
+    split_period,
+)
+from profile_stats import period_tests
+
+FORMATS = ["png", "svg", "html"]
+STATIC_FORMATS = {"png", "svg"}
+MANIFEST_NAME = "manifest.json"
+# Bump when the figure factory changes in a way that should invalidate exports
+RENDER_VERSION = 2
+
+
+def _slug(text):
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_").lower()
+
+
+def _area_dirs(areas):
+    # Output folder per area. Names that slug to the same folder ("Area 001",
+    # "Area-001") each get a short hash of the name so no area overwrites another.
+    slugs = {area: _slug(area) for area in areas}
+    counts = {}
+    for slug in slugs.values():
+        counts[slug] = counts.get(slug, 0) + 1
+    return {
+        area: slug
+        if counts[slug] == 1
+        else f"{slug}_{hashlib.sha256(area.encode('utf-8')).hexdigest()[:8]}"
+        for area, slug in slugs.items()
+    }
+
+
+def _area_hash(area_df, formats, zoom, area_dir):
+    payload = {
+        "version": RENDER_VERSION,
+        "dir": area_dir,
+        "formats": sorted(formats),
+        "zoom": zoom,
+        "split_period": split_period,
+        "data": area_df.to_dict(orient="list"),
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def _render_area(area, area_dir, records, annotations, out_dir, formats, zoom):
+    # Runs in a worker process: one area, all metrics, all formats
+    import pandas as pd
+    import plotly.io as pio
+
+    area_df = pd.DataFrame.from_records(records)
+    area_dir = os.path.join(out_dir, area_dir)
+    os.makedirs(area_dir, exist_ok=True)
+
+    figures, image_paths = [], []
+    for metric in METRICS:
+        y_min, y_max = metric["zoom_range"] if zoom else FULL_RANGE
+        fig = make_metric_figure(
+            area_df,
+            metric["value_col"],
+            metric["ci_col"],
+            f"{area} – {metric['title']}",
+            y_min,
+            y_max,
+            annotation=annotations.get(metric["key"]),
+        )
+        base = os.path.join(area_dir, metric["key"])
+        if "html" in formats:
+            fig.write_html(f"{base}.html", include_plotlyjs="cdn", full_html=True)
+        for fmt in formats:
+            if fmt in STATIC_FORMATS:
+                figures.append(fig)
+                image_paths.append(f"{base}.{fmt}")
+
+    # One Kaleido session per area rather than one per image
+    if figures:
+        pio.write_images(figures, image_paths, width=1000, height=500)
+
+    return area, len(METRICS) * len(formats)
+
+
+def _static_export_problem():
+    # PNG/SVG go through Kaleido, which (1.x) drives a local Chrome. Render one
+    # tiny image up front so a missing install fails once, not once per area.
+    try:
+        import kaleido  # noqa: F401
+    except ImportError:
+        return "PNG/SVG export needs kaleido: pip install 'kaleido>=1'"
+    import plotly.graph_objects as go
+    import plotly.io as pio
+
+    try:
+        pio.to_image(go.Figure(), format="png", width=10, height=10)
+    except Exception as exc:
+        reason = str(exc).strip().splitlines()[0]
+        return (
+            f"PNG/SVG export is unavailable ({reason}). Kaleido needs Chrome: "
+            "install it with `plotly_get_chrome`, or use --formats html"
+        )
+    return None
+
+
+def _load_manifest(out_dir):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as fh:
+        return json.load(fh)
+
+
+def _save_manifest(out_dir, manifest):
+    path = os.path.join(out_dir, MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--profiles", help="CSV with Area, Period and metric columns")
+    source.add_argument("--dummy-areas", type=int, help="Export N dummy areas instead")
+    parser.add_argument("--out", default="exports", help="Output directory")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=FORMATS)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument(
+        "--full-range", action="store_true", help="Use 0–100%% y-axes instead of zoomed ranges"
+    )
+    parser.add_argument("--force", action="store_true", help="Re-render unchanged areas")
+    args = parser.parse_args(argv)
+
+    formats = sorted(set(args.formats))
+    if STATIC_FORMATS & set(formats):
+        problem = _static_export_problem()
+        if problem:
+            parser.error(problem)
+
+    if args.profiles:
+        try:
+            profiles = load_area_profiles(args.profiles)
+        except ValueError as exc:
+            parser.error(str(exc))
+    else:
+        profiles = dummy_area_profiles(args.dummy_areas)
+
+    zoom = not args.full_range
+    os.makedirs(args.out, exist_ok=True)
+    manifest = {} if args.force else _load_manifest(args.out)
+
+    jobs, skipped = {}, 0
+    area_dirs = _area_dirs(profiles["Area"].unique())
+    for area, area_df in profiles.groupby("Area", sort=False):
+        digest = _area_hash(area_df, formats, zoom, area_dirs[area])
+        if manifest.get(area) == digest:
+            skipped += 1
+            continue
+        jobs[area] = (digest, area_df.to_dict(orient="records"))
+
+    start = time.perf_counter()
+
+    # Significance tests for every area and metric in one vectorised pass
+    tests = period_tests(profiles)
+    annotations = {
+        area: {
+            metric["key"]: significance_annotation(tests.loc[(area, metric["key"])])
+            for metric in METRICS
+        }
+        for area in jobs
+    }
+
+    rendered, failed = 0, []
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(
+                _render_area,
+                area,
+                area_dirs[area],
+                records,
+                annotations[area],
+                args.out,
+                formats,
+                zoom,
+            ): area
+            for area, (_, records) in jobs.items()
+        }
+        for future in as_completed(futures):
+            area = futures[future]
+            try:
+                _, n_files = future.result()
+            except Exception as exc:
+                failed.append(area)
+                print(f"FAILED {area}: {exc}", file=sys.stderr)
+                continue
+            rendered += n_files
+            manifest[area] = jobs[area][0]
+    elapsed = time.perf_counter() - start
+
+    _save_manifest(args.out, manifest)
+
+    rate = rendered / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Rendered {rendered} files for {len(jobs) - len(failed)} areas in {elapsed:.1f}s "
+        f"({rate:.1f} files/s, {args.workers} workers); "
+        f"skipped {skipped} unchanged areas; {len(failed)} failed"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
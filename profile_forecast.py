@@ -0,0 +1,274 @@
+"""Trend and nowcast projections for APS labour market profiles.
+
+Fits a local linear trend state-space model to every area x metric series,
+using the published CIs as observation variances so noisy years count for
+less. Fits are cached; when a new period arrives only the new observations
+are filtered through the cached state, and a full refit happens only when
+the history itself changes.
+
+    python profile_forecast.py --profiles profiles.csv --out forecasts.csv
+    python profile_forecast.py --dummy-areas 300 --workers 8 --horizon 2
+"""
+import argparse
+import hashlib
+import os
+import pickle
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from kirklees_profile import METRICS, dummy_area_profiles, load_area_profiles
+from profile_stats import profile_arrays
+from stats_common import Z_95
+
+DEFAULT_CACHE = os.path.join(".cache", "forecast_fits.pkl")
+# Bump when the model changes so stale cached fits are refitted
+MODEL_VERSION = 1
+
+# Candidate level / trend disturbance variances (ppts^2); the pair with the
+# highest likelihood is kept per series
+LEVEL_VARS = np.array([0.05, 0.2, 0.5, 1.0, 2.0, 4.0])
+TREND_VARS = np.array([0.0, 0.01, 0.05, 0.2])
+BATCH_SIZE = 256
+
+
+# ---------------------------------------------------------
+# LOCAL LINEAR TREND KALMAN FILTER (VECTORISED OVER SERIES)
+# ---------------------------------------------------------
+def _initial_state(y0, r0):
+    level = np.nan_to_num(y0)
+    zeros = np.zeros_like(level)
+    # Level starts at the first observation with its sampling variance; the
+    # trend starts vague
+    p11 = np.nan_to_num(r0, nan=100.0)
+    return [level, zeros, p11, zeros.copy(), np.full_like(level, 4.0)]
+
+
+def _filter(state, y, r, q_level, q_trend):
+    # Run the filter over y[S, T] with observation variances r[S, T].
+    # state = [level, trend, p11, p12, p22], each of shape [S]. Returns the
+    # updated state and the log-likelihood contribution of each series.
+    level, trend, p11, p12, p22 = (a.copy() for a in state)
+    loglik = np.zeros_like(level)
+    for t in range(y.shape[1]):
+        # Predict
+        level, trend = level + trend, trend
+        p11, p12, p22 = p11 + 2 * p12 + p22 + q_level, p12 + p22, p22 + q_trend
+
+        # Update (missing observations are skipped)
+        obs = ~np.isnan(y[:, t])
+        innov = np.where(obs, y[:, t] - level, 0.0)
+        f = p11 + np.where(obs, r[:, t], 1.0)
+        k1 = np.where(obs, p11 / f, 0.0)
+        k2 = np.where(obs, p12 / f, 0.0)
+        level, trend = level + k1 * innov, trend + k2 * innov
+        p11, p12, p22 = p11 - k1 * p11, p12 - k1 * p12, p22 - k2 * p12
+        loglik -= np.where(obs, 0.5 * (np.log(2 * np.pi * f) + innov**2 / f), 0.0)
+    return [level, trend, p11, p12, p22], loglik
+
+
+def _fit_batch(y, r):
+    # Grid-search the disturbance variances for a batch of series y[S, T]
+    n_series = y.shape[0]
+    q_level, q_trend = (g.ravel() for g in np.meshgrid(LEVEL_VARS, TREND_VARS))
+    n_grid = len(q_level)
+
+    # Every (series, grid point) pair is filtered in parallel
+    y_rep, r_rep = np.repeat(y, n_grid, axis=0), np.repeat(r, n_grid, axis=0)
+    ql_rep, qt_rep = np.tile(q_level, n_series), np.tile(q_trend, n_series)
+    state = _initial_state(y_rep[:, 0], r_rep[:, 0])
+    # The first observation initialises the level, so the likelihood starts at t=1
+    state, loglik = _filter(state, y_rep[:, 1:], r_rep[:, 1:], ql_rep, qt_rep)
+
+    best = np.argmax(loglik.reshape(n_series, n_grid), axis=1)
+    rows = np.arange(n_series) * n_grid + best
+    return [a[rows] for a in state], q_level[best], q_trend[best]
+
+
+def _forecast(state, q_level, q_trend, horizon):
+    level, trend, p11, p12, p22 = state
+    means, variances = [], []
+    for _ in range(horizon):
+        level = level + trend
+        p11, p12, p22 = p11 + 2 * p12 + p22 + q_level, p12 + p22, p22 + q_trend
+        means.append(level)
+        variances.append(p11)
+    return np.stack(means, axis=1), np.stack(variances, axis=1)
+
+
+# ---------------------------------------------------------
+# CACHED, INCREMENTAL FITTING
+# ---------------------------------------------------------
+def _series_hash(values, ses):
+    return hashlib.sha256(
+        np.ascontiguousarray(values).tobytes() + np.ascontiguousarray(ses).tobytes()
+    ).hexdigest()
+
+
+def next_periods(last_period, horizon):
+    # "2024-25" -> ["2025-26", "2026-27", ...]
+    if not re.fullmatch(r"\d{4}-\d{2}", str(last_period)):
+        raise ValueError(
+            f"cannot project past period {last_period!r}; expected YYYY-YY labels like 2024-25"
+        )
+    start = int(last_period[:4])
+    return [f"{start + h}-{(start + h + 1) % 100:02d}" for h in range(1, horizon + 1)]
+
+
+def load_fit_cache(path):
+    if path and os.path.exists(path):
+        with open(path, "rb") as fh:
+            cache = pickle.load(fh)
+        if cache.get("version") == MODEL_VERSION:
+            return cache
+    return {"version": MODEL_VERSION, "fits": {}}
+
+
+def save_fit_cache(path, cache):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as fh:
+        pickle.dump(cache, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def fit_forecasts(profiles, horizon=2, cache=None, workers=1):
+    # Project every area x metric `horizon` periods ahead. `cache` (see
+    # load_fit_cache) is updated in place. Returns (forecasts, counts) where
+    # counts says how many series were reused, extended or refitted.
+    cache = cache if cache is not None else {"version": MODEL_VERSION, "fits": {}}
+    fits = cache["fits"]
+
+    areas, period_list, values, ses = profile_arrays(profiles)
+    keys = [(area, m["key"]) for area in areas for m in METRICS]
+    y = values.reshape(len(keys), -1)
+    r = (ses**2).reshape(len(keys), -1)
+    n_periods = len(period_list)
+
+    state = [np.zeros(len(keys)) for _ in range(5)]
+    q_level, q_trend = np.zeros(len(keys)), np.zeros(len(keys))
+    reuse, extend, refit = [], [], []
+    for i, key in enumerate(keys):
+        fit = fits.get(key)
+        n_seen = len(fit["periods"]) if fit else 0
+        if (
+            fit
+            and n_seen <= n_periods
+            and tuple(period_list[:n_seen]) == fit["periods"]
+            and _series_hash(y[i, :n_seen], r[i, :n_seen]) == fit["hash"]
+        ):
+            (reuse if n_seen == n_periods else extend).append(i)
+        else:
+            refit.append(i)
+
+    def _store(idx, new_state, ql, qt):
+        for j in range(5):
+            state[j][idx] = new_state[j]
+        q_level[idx], q_trend[idx] = ql, qt
+
+    # Unchanged history: reuse the cached state as-is
+    for i in reuse:
+        fit = fits[keys[i]]
+        _store(i, fit["state"], fit["q_level"], fit["q_trend"])
+
+    # New periods only: filter the new observations through the cached state,
+    # keeping the cached variances
+    if extend:
+        by_start = {}
+        for i in extend:
+            by_start.setdefault(len(fits[keys[i]]["periods"]), []).append(i)
+        for n_seen, idx in by_start.items():
+            idx = np.array(idx)
+            cached = [fits[keys[i]] for i in idx]
+            ql = np.array([f["q_level"] for f in cached])
+            qt = np.array([f["q_trend"] for f in cached])
+            start = [np.array([f["state"][j] for f in cached]) for j in range(5)]
+            new_state, _ = _filter(start, y[idx, n_seen:], r[idx, n_seen:], ql, qt)
+            _store(idx, new_state, ql, qt)
+
+    # Changed or unseen history: full refit, in batches across processes
+    if refit:
+        idx = np.array(refit)
+        batches = [idx[i : i + BATCH_SIZE] for i in range(0, len(idx), BATCH_SIZE)]
+        args = [(y[b], r[b]) for b in batches]
+        if workers > 1 and len(batches) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_fit_batch, *zip(*args)))
+        else:
+            results = [_fit_batch(*a) for a in args]
+        for b, (new_state, ql, qt) in zip(batches, results):
+            _store(b, new_state, ql, qt)
+
+    for i in extend + refit:
+        fits[keys[i]] = {
+            "periods": tuple(period_list),
+            "hash": _series_hash(y[i], r[i]),
+            "state": [float(a[i]) for a in state],
+            "q_level": float(q_level[i]),
+            "q_trend": float(q_trend[i]),
+        }
+
+    means, variances = _forecast(state, q_level, q_trend, horizon)
+    half_width = Z_95 * np.sqrt(variances)
+    # Rates are percentages, so keep the interval inside 0–100
+    low, high = np.clip(means - half_width, 0, 100), np.clip(means + half_width, 0, 100)
+    future = next_periods(period_list[-1], horizon)
+    forecasts = pd.DataFrame(
+        {
+            "Area": np.repeat([k[0] for k in keys], horizon),
+            "Metric": np.repeat([k[1] for k in keys], horizon),
+            "Period": np.tile(future, len(keys)),
+            "Forecast": means.ravel(),
+            "Low": low.ravel(),
+            "High": high.ravel(),
+        }
+    )
+    counts = {"reused": len(reuse), "extended": len(extend), "refitted": len(refit)}
+    return forecasts, counts
+
+
+# ---------------------------------------------------------
+# CLI
+# ---------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--profiles", help="CSV with Area, Period and metric columns")
+    source.add_argument("--dummy-areas", type=int, help="Forecast N dummy areas instead")
+    parser.add_argument("--out", default="forecasts.csv", help="Output CSV")
+    parser.add_argument("--cache", default=DEFAULT_CACHE, help="Fit cache file")
+    parser.add_argument("--horizon", type=int, default=2, help="Periods to project")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+    if args.horizon < 1:
+        parser.error("--horizon must be at least 1")
+
+    try:
+        if args.profiles:
+            profiles = load_area_profiles(args.profiles)
+        else:
+            profiles = dummy_area_profiles(args.dummy_areas)
+        # Fail on unprojectable period labels before any fitting starts
+        next_periods(profiles["Period"].unique()[-1], args.horizon)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    cache = load_fit_cache(args.cache)
+    start = time.perf_counter()
+    forecasts, counts = fit_forecasts(profiles, args.horizon, cache, args.workers)
+    elapsed = time.perf_counter() - start
+    save_fit_cache(args.cache, cache)
+    forecasts.to_csv(args.out, index=False)
+
+    print(
+        f"Projected {sum(counts.values())} series in {elapsed:.2f}s "
+        f"({counts['refitted']} refitted, {counts['extended']} extended, "
+        f"{counts['reused']} reused) -> {args.out}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
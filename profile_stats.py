@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+from kirklees_profile import METRICS, MIN_SEGMENT_PERIODS, split_period
+from stats_common import Z_95, two_sided_p
+
+
+# ---------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------
+def profile_arrays(profiles):
+    # Long profiles -> (areas, periods, values[A, M, T], standard errors[A, M, T])
+    areas = list(dict.fromkeys(profiles["Area"]))
+    period_list = list(dict.fromkeys(profiles["Period"]))
+    wide = profiles.set_index(["Area", "Period"]).reindex(
+        pd.MultiIndex.from_product([areas, period_list])
+    )
+    shape = (len(areas), len(period_list))
+    values = np.stack(
+        [wide[m["value_col"]].to_numpy(float).reshape(shape) for m in METRICS], axis=1
+    )
+    ses = np.stack(
+        [wide[m["ci_col"]].to_numpy(float).reshape(shape) for m in METRICS], axis=1
+    ) / Z_95
+    return areas, period_list, values, ses
+
+
+def _segment_stats(cum_v, cum_var, k, n_total):
+    # Difference in means (post - pre) for a split where the post period starts at k.
+    # The mean of n independent estimates has variance sum(se^2) / n^2.
+    pre_mean = cum_v[..., k - 1] / k
+    post_mean = (cum_v[..., -1:] - cum_v[..., k - 1]) / (n_total - k)
+    pre_var = cum_var[..., k - 1] / k**2
+    post_var = (cum_var[..., -1:] - cum_var[..., k - 1]) / (n_total - k) ** 2
+    diff = post_mean - pre_mean
+    se = np.sqrt(pre_var + post_var)
+    return pre_mean, post_mean, diff, se
+
+
+# ---------------------------------------------------------
+# TEST ENGINE
+# ---------------------------------------------------------
+def period_tests(profiles, split_period=split_period, min_segment=MIN_SEGMENT_PERIODS):
+    # KBOP vs pre-KBOP difference in means plus a changepoint scan over every
+    # candidate split, for all areas and metrics in one pass over [A, M, T] arrays
+    areas, period_list, values, ses = profile_arrays(profiles)
+    n_total = len(period_list)
+    cum_v = np.cumsum(values, axis=-1)
+    cum_var = np.cumsum(ses**2, axis=-1)
+
+    # Fixed split at the KBOP start
+    if split_period not in period_list[1:]:
+        raise ValueError(f"split period {split_period} must follow at least one other period")
+    k = np.array([period_list.index(split_period)])
+    pre_mean, post_mean, diff, se = (
+        a[..., 0] for a in _segment_stats(cum_v, cum_var, k, n_total)
+    )
+    z = diff / se
+
+    # Changepoint scan: every split leaving at least `min_segment` periods each side
+    candidates = np.arange(min_segment, n_total - min_segment + 1)
+    if len(candidates):
+        _, _, scan_diff, scan_se = _segment_stats(cum_v, cum_var, candidates, n_total)
+        scan_z = scan_diff / scan_se
+        best = np.nanargmax(np.abs(np.nan_to_num(scan_z)), axis=-1)
+        best_period = np.asarray(period_list, dtype=object)[candidates[best]]
+        best_z = np.take_along_axis(scan_z, best[..., None], axis=-1)[..., 0]
+        best_diff = np.take_along_axis(scan_diff, best[..., None], axis=-1)[..., 0]
+        # Bonferroni over the candidate splits, as the scan picks the largest |z|
+        best_p = np.minimum(two_sided_p(best_z) * len(candidates), 1.0)
+    else:
+        # Too few periods to scan: no changepoint
+        best_period = np.full(diff.shape, None, dtype=object)
+        best_z = best_diff = best_p = np.full(diff.shape, np.nan)
+
+    n_areas, n_metrics = len(areas), len(METRICS)
+    return pd.DataFrame(
+        {
+            "Area": np.repeat(areas, n_metrics),
+            "Metric": np.tile([m["key"] for m in METRICS], n_areas),
+            "Pre_mean": pre_mean.ravel(),
+            "KBOP_mean": post_mean.ravel(),
+            "Diff": diff.ravel(),
+            "Diff_ci": (Z_95 * se).ravel(),
+            "z": z.ravel(),
+            "p_value": two_sided_p(z).ravel(),
+            "Changepoint_period": best_period.ravel(),
+            "Changepoint_diff": best_diff.ravel(),
+            "Changepoint_z": best_z.ravel(),
+            "Changepoint_p_adj": best_p.ravel(),
+        }
+    ).set_index(["Area", "Metric"])
+
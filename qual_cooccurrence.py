@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Code co-occurrence for the qualitative strand: how many documents contain
+# both of a pair of codes. Documents x codes is kept as a sparse 0/1 incidence
+# matrix A, so co-occurrence is the sparse product A^T A and never materialises
+# a dense document x code table, whatever the number of (sub)codes.
+
+
+def incidence_matrix(segments, code_column="Thematic_group", codes=None):
+    # (documents x codes) CSR matrix, 1 where a document has at least one
+    # segment with that code. Returns (matrix, document ids, code labels).
+    doc_codes, doc_ids = pd.factorize(segments["Document_id"])
+    values = pd.Categorical(segments[code_column], categories=codes)
+    a = sparse.csr_matrix(
+        (np.ones(len(segments), dtype=np.int32), (doc_codes, values.codes)),
+        shape=(len(doc_ids), len(values.categories)),
+    )
+    # Duplicate (document, code) entries were summed; only presence counts
+    a.data[:] = 1
+    return a, doc_ids, list(values.categories)
+
+
+def cooccurrence(segments, code_column="Thematic_group", codes=None, **filters):
+    # Documents containing each pair of codes, as a sparse (codes x codes)
+    # matrix whose diagonal is the number of documents with each code.
+    # filters restrict the segments first, e.g. Level="Programme", Phase=...
+    mask = np.ones(len(segments), dtype=bool)
+    for col, value in filters.items():
+        if value is not None:
+            mask &= (segments[col] == value).to_numpy()
+    a, doc_ids, labels = incidence_matrix(segments[mask], code_column, codes)
+    return (a.T @ a).tocsr(), labels, len(doc_ids)
+
+
+def top_pairs(matrix, labels, n=20):
+    # Most frequent off-diagonal pairs, for code sets too large for a heatmap
+    upper = sparse.triu(matrix, k=1).tocoo()
+    order = np.argsort(-upper.data, kind="stable")[:n]
+    diagonal = matrix.diagonal()
+    rows, cols = upper.row[order], upper.col[order]
+    labels = np.asarray(labels, dtype=object)
+    return pd.DataFrame(
+        {
+            "Code_a": labels[rows],
+            "Code_b": labels[cols],
+            "Documents": upper.data[order],
+            # Share of documents with either code that have both
+            "Jaccard": upper.data[order] / (diagonal[rows] + diagonal[cols] - upper.data[order]),
+        }
+    )
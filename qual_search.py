@@ -0,0 +1,305 @@
+"""BM25 full-text search over qualitative coded segments.
+
+Builds an inverted index (token -> segment ids and term frequencies) over the
+coded segment text, keeps each segment's Accelerator_id, Document_group,
+Phase, Level and Thematic_group codes alongside it, and saves everything as .npy
+files. Opening an index memory-maps those files, so a search reads only the
+postings of the query terms and the excerpts it returns.
+
+    python qual_search.py --build
+    python qual_search.py "data sharing barriers" --accelerator "Neighbourhood health x Essex"
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_INDEX_DIR = os.path.join(".cache", "qual_index")
+# Bump when the index layout or tokeniser changes so old indexes are rebuilt
+INDEX_VERSION = 4
+
+CODE_COLUMNS = ["Accelerator_id", "Document_group", "Phase", "Level", "Thematic_group"]
+# Standard BM25 parameters
+K1 = 1.2
+B = 0.75
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a about after an and are around as at be behind by for from in into is it of on "
+    "or over the their to with".split()
+)
+_ARRAYS = ["offsets", "postings", "tf", "doc_len", "text", "text_offsets"]
+
+
+# ---------------------------------------------------------
+# BUILD
+# ---------------------------------------------------------
+def tokenize(text):
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def build_index(segments, texts=None, chunk_size=100_000):
+    # segments: one row per coded segment with CODE_COLUMNS, and the segment
+    # text either in a Text column or as an iterable in the same order.
+    # Texts are tokenised a chunk at a time, so only one chunk's tokens are
+    # held at once.
+    if texts is None:
+        texts = segments["Text"]
+    texts = iter(texts)
+    vocabulary = {}
+    term_parts, doc_parts, tf_parts = [], [], []
+    doc_lens, byte_lens, encoded = [], [], []
+    n = 0
+    while True:
+        chunk = [text for _, text in zip(range(chunk_size), texts)]
+        if not chunk:
+            break
+        tokens = [tokenize(text) for text in chunk]
+        doc_len = np.fromiter((len(t) for t in tokens), dtype=np.int32, count=len(tokens))
+        term_ids = np.fromiter(
+            (vocabulary.setdefault(t, len(vocabulary)) for doc in tokens for t in doc),
+            dtype=np.int64,
+            count=int(doc_len.sum()),
+        )
+        # (term, segment) pairs of the chunk, counted
+        local = np.repeat(np.arange(len(chunk), dtype=np.int64), doc_len)
+        pairs, tf = np.unique(term_ids * len(chunk) + local, return_counts=True)
+        term_parts.append((pairs // len(chunk)).astype(np.int32))
+        doc_parts.append((pairs % len(chunk) + n).astype(np.int32))
+        tf_parts.append(tf.astype(np.uint16))
+        doc_lens.append(doc_len)
+        chunk_bytes = [text.encode("utf-8") for text in chunk]
+        byte_lens.append(np.fromiter(map(len, chunk_bytes), dtype=np.int64, count=len(chunk)))
+        encoded.append(b"".join(chunk_bytes))
+        n += len(chunk)
+
+    # Chunks are in segment order, so a stable sort by term gives CSR postings
+    # sorted by term then segment
+    pair_terms = np.concatenate(term_parts) if n else np.zeros(0, dtype=np.int32)
+    order = np.argsort(pair_terms, kind="stable")
+    offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum(np.bincount(pair_terms, minlength=len(vocabulary)))
+    doc_len = np.concatenate(doc_lens) if n else np.zeros(0, dtype=np.int32)
+    text_offsets = np.zeros(n + 1, dtype=np.int64)
+    if n:
+        text_offsets[1:] = np.cumsum(np.concatenate(byte_lens))
+
+    codes, labels = {}, {}
+    for col in CODE_COLUMNS:
+        if col.endswith("_id"):
+            # Integer keys are stored as they are
+            codes[col] = segments[col].to_numpy(np.int32)
+            continue
+        values = pd.Categorical(segments[col])
+        labels[col] = [str(c) for c in values.categories]
+        codes[col] = values.codes
+
+    return {
+        "offsets": offsets,
+        "postings": np.concatenate(doc_parts)[order] if n else np.zeros(0, dtype=np.int32),
+        "tf": np.concatenate(tf_parts)[order] if n else np.zeros(0, dtype=np.uint16),
+        "doc_len": doc_len,
+        "text": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "text_offsets": text_offsets,
+        "codes": codes,
+        "meta": {
+            "vocabulary": list(vocabulary),
+            "labels": labels,
+            "n_segments": n,
+            "avg_doc_len": float(doc_len.mean()) if n else 0.0,
+        },
+    }
+
+
+def save_index(index, path, key=None):
+    # Written to a scratch directory first so readers never see a partial index
+    tmp = f"{path}.tmp-{os.getpid()}"
+    os.makedirs(tmp, exist_ok=True)
+    for name in _ARRAYS:
+        np.save(os.path.join(tmp, f"{name}.npy"), index[name])
+    for col, values in index["codes"].items():
+        np.save(os.path.join(tmp, f"code_{col}.npy"), values)
+    with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as fh:
+        json.dump({**index["meta"], "version": INDEX_VERSION, "key": key}, fh)
+    # Swap the old index aside rather than deleting it first, so the only
+    # moment without an index at `path` is between two renames
+    old = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, old)
+    os.replace(tmp, path)
+    shutil.rmtree(old, ignore_errors=True)
+
+
+def open_index(path, key=None):
+    # Memory-mapped index, or None if it is missing, from an older version or
+    # built from different source data (`key`)
+    meta_path = os.path.join(path, "meta.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding="utf-8") as fh:
+        meta = json.load(fh)
+    if meta.get("version") != INDEX_VERSION or meta.get("key") != key:
+        return None
+    index = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in _ARRAYS}
+    index["codes"] = {
+        col: np.load(os.path.join(path, f"code_{col}.npy"), mmap_mode="r") for col in CODE_COLUMNS
+    }
+    index["meta"] = meta
+    index["term_ids"] = {term: i for i, term in enumerate(meta["vocabulary"])}
+    return index
+
+
+# ---------------------------------------------------------
+# SEARCH
+# ---------------------------------------------------------
+def _hits(index, docs, scores):
+    # Result frame for segments `docs`; typed the same way when there are none
+    labels = index["meta"]["labels"]
+    text, text_offsets = index["text"], index["text_offsets"]
+    return pd.DataFrame(
+        {
+            "Score": scores.round(3),
+            **{
+                col: (
+                    np.asarray(labels[col], dtype=object)[index["codes"][col][docs]]
+                    if col in labels
+                    else np.asarray(index["codes"][col][docs])
+                )
+                for col in CODE_COLUMNS
+            },
+            "Excerpt": np.array(
+                [bytes(text[text_offsets[d]:text_offsets[d + 1]]).decode("utf-8") for d in docs],
+                dtype=object,
+            ),
+        }
+    )
+
+
+def search(index, query, k=20, **filters):
+    # Top-k segments by BM25 score for `query`, optionally restricted to code
+    # values, e.g. search(index, "data sharing", Accelerator_id=4, Phase="...").
+    # Returns (results, number of matching segments).
+    meta = index["meta"]
+    vocabulary = index["term_ids"]
+    term_ids = [vocabulary[t] for t in dict.fromkeys(tokenize(query)) if t in vocabulary]
+    if not term_ids:
+        return _hits(index, np.empty(0, dtype=np.int64), np.empty(0)), 0
+
+    n_docs, avg_len = meta["n_segments"], meta["avg_doc_len"]
+    doc_parts, score_parts = [], []
+    for t in term_ids:
+        start, end = index["offsets"][t], index["offsets"][t + 1]
+        docs = np.asarray(index["postings"][start:end])
+        tf = np.asarray(index["tf"][start:end], dtype=float)
+        idf = np.log1p((n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+        norm = K1 * (1 - B + B * index["doc_len"][docs] / avg_len)
+        doc_parts.append(docs)
+        score_parts.append(idf * tf * (K1 + 1) / (tf + norm))
+
+    docs, inverse = np.unique(np.concatenate(doc_parts), return_inverse=True)
+    scores = np.bincount(inverse, weights=np.concatenate(score_parts))
+
+    keep = np.ones(len(docs), dtype=bool)
+    for col, value in filters.items():
+        if value is None:
+            continue
+        labels = meta["labels"].get(col)
+        if labels is not None:
+            if value not in labels:
+                return _hits(index, np.empty(0, dtype=np.int64), np.empty(0)), 0
+            value = labels.index(value)
+        keep &= index["codes"][col][docs] == value
+    docs, scores = docs[keep], scores[keep]
+
+    top = np.arange(len(scores))
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return _hits(index, docs[top], scores[top]), int(keep.sum())
+
+
+# ---------------------------------------------------------
+# DUMMY SEGMENTS
+# ---------------------------------------------------------
+def dummy_index_key(qual_df):
+    # The dummy segments are fully determined by qual_df and the generator
+    # settings in tlg_data (code lists, phrase banks, documents per group, seed)
+    import hashlib
+
+    import tlg_data
+
+    generator = {
+        name: getattr(tlg_data, name)
+        for name in [
+            "QUAL_DOC_GROUPS",
+            "QUAL_PHASES",
+            "QUAL_LEVELS",
+            "QUAL_THEMATIC_GROUPS",
+            "QUAL_DOCS_PER_GROUP",
+            "QUAL_SEGMENT_SEED",
+            "QUAL_SEGMENT_ACTORS",
+            "QUAL_SEGMENT_FINDINGS",
+            "QUAL_SEGMENT_DETAILS",
+        ]
+    }
+    digest = hashlib.sha256(json.dumps(generator, sort_keys=True).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(qual_df, index=False).to_numpy().tobytes())
+    return f"dummy-{digest.hexdigest()[:16]}"
+
+
+def open_dummy_index(path=DEFAULT_INDEX_DIR, qual_df=None, rebuild=False):
+    # Index over tlg_data.build_segments, built and saved on first use
+    from tlg_data import build_dummy_data, build_segments, segment_texts
+
+    if qual_df is None:
+        qual_df = build_dummy_data()["qual_df"]
+    key = dummy_index_key(qual_df)
+    index = None if rebuild else open_index(path, key)
+    if index is None:
+        segments = build_segments(qual_df)
+        save_index(build_index(segments, segment_texts(segments)), path, key)
+        index = open_index(path, key)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("query", nargs="?", help="Search terms")
+    parser.add_argument("--index", default=DEFAULT_INDEX_DIR, help="Index directory")
+    parser.add_argument("--build", action="store_true", help="Rebuild the dummy index")
+    parser.add_argument("-k", type=int, default=10, help="Results to show")
+    parser.add_argument("--accelerator", help="Filter on accelerator name")
+    for col in CODE_COLUMNS[1:]:
+        parser.add_argument(f"--{col.lower().replace('_', '-')}", dest=col, help=f"Filter on {col}")
+    args = parser.parse_args(argv)
+
+    from tlg_data import ACCELERATORS
+
+    filters = {col: getattr(args, col) for col in CODE_COLUMNS[1:]}
+    if args.accelerator:
+        filters["Accelerator_id"] = ACCELERATORS.index(args.accelerator)
+
+    start = time.perf_counter()
+    index = open_dummy_index(args.index, rebuild=args.build)
+    print(f"Opened {index['meta']['n_segments']:,} segments in {time.perf_counter() - start:.2f}s")
+    if not args.query:
+        return 0
+
+    start = time.perf_counter()
+    results, n_matches = search(index, args.query, args.k, **filters)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"{n_matches:,} matching segments in {elapsed:.1f} ms")
+    for row in results.itertuples(index=False):
+        accelerator = ACCELERATORS[row.Accelerator_id]
+        print(f"{row.Score:>7.2f}  {accelerator} | {row.Thematic_group}\n         {row.Excerpt}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
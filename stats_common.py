@@ -0,0 +1,14 @@
+import numpy as np
+from scipy.special import erfc
+
+# Normal-theory helpers shared by the Kirklees profile tests (profile_stats,
+# profile_forecast) and the TLG survey change engine (survey_change). Kept free
+# of either dashboard's data modules so each imports only what it uses.
+
+# Two-sided 95% normal quantile; APS CIs are published at this level
+Z_95 = 1.959964
+
+
+def two_sided_p(z):
+    # Normal two-sided p-value, 2 * (1 - Phi(|z|))
+    return erfc(np.abs(np.asarray(z, dtype=float)) / np.sqrt(2.0))
@@ -1,349 +1,42 @@
 import os
-import numpy as np
-import pandas as pd
-import plotly.express as px
+
 import streamlit as st
 
-# -------------------------------------------------------------------
-# PAGE CONFIG
-# -------------------------------------------------------------------
-st.set_page_config(
-    page_title="TLG Evaluation Dashboard",
-    layout="wide",
-    page_icon="📊",
+from dashboard_core import (
+    DARK_THEME_CSS,
+    FONT_CSS,
+    SIDEBAR_CSS,
+    accelerator_map,
+    accelerator_rows,
+    accent_bar,
+    configure_page,
+    cooccurrence_heatmap,
+    likert_bar,
+    load_cooccurrence,
+    load_tlg_registry,
+    search_segments,
+    show_chart,
+    wave_dumbbell,
+    with_accelerator_names,
 )
-
-# -------------------------------------------------------------------
-# BASIC STYLING
-# -------------------------------------------------------------------
-
-# Global font
-st.markdown(
-    """
-    <style>
-    * {
-        font-family: 'Verdana', sans-serif;
-    }
-    </style>
-    """,
-    unsafe_allow_html=True,
-)
-
-# Sidebar width
-st.markdown(
-    """
-    <style>
-        [data-testid="stSidebar"] {
-            min-width: 220px;
-            max-width: 320px;
-        }
-    </style>
-    """,
-    unsafe_allow_html=True,
+from instrumentation import render_debug_panel, section, start_rerun
+from tlg_data import (
+    ACCELERATORS,
+    BATTERIES,
+    QUAL_DOC_GROUPS,
+    QUAL_LEVELS,
+    QUAL_PHASES,
+    SURVEY_WAVES,
 )
 
 # -------------------------------------------------------------------
-# CONSTANTS / DUMMY DATA DEFINITIONS
+# PAGE CONFIG / BASIC STYLING
 # -------------------------------------------------------------------
-np.random.seed(42)
-
-# Actual accelerators
-ACCELERATORS = [
-    "Best Start in Life (BSIL) x Northumberland",
-    "Best Start in Life (BSIL) x Manchester",
-    "Neighbourhood health x Plymouth",
-    "Neighbourhood health x Liverpool",
-    "Neighbourhood health x Essex",
-    "Economic inactivity x Wakefield",
-    "Violence Against Women and Girls (VAWG) x London",
-    "SEND transitions x Sandwell",
-    "SEND transition x Nottingham",
-    "AI at the frontline x Barnsley",
-]
-
-# Approximate coordinates for each accelerator place
-ACCELERATOR_GEO = {
-    "Best Start in Life (BSIL) x Northumberland": {
-        "Place": "Northumberland",
-        "lat": 55.1667,
-        "lon": -2.0000,
-    },
-    "Best Start in Life (BSIL) x Manchester": {
-        "Place": "Manchester",
-        "lat": 53.4808,
-        "lon": -2.2426,
-    },
-    "Neighbourhood health x Plymouth": {
-        "Place": "Plymouth",
-        "lat": 50.3755,
-        "lon": -4.1427,
-    },
-    "Neighbourhood health x Liverpool": {
-        "Place": "Liverpool",
-        "lat": 53.4084,
-        "lon": -2.9916,
-    },
-    "Neighbourhood health x Essex": {
-        "Place": "Essex (Chelmsford)",
-        "lat": 51.7360,
-        "lon": 0.4790,
-    },
-    "Economic inactivity x Wakefield": {
-        "Place": "Wakefield",
-        "lat": 53.6829,
-        "lon": -1.4969,
-    },
-    "Violence Against Women and Girls (VAWG) x London": {
-        "Place": "London",
-        "lat": 51.5074,
-        "lon": -0.1278,
-    },
-    "SEND transitions x Sandwell": {
-        "Place": "Sandwell",
-        "lat": 52.5050,
-        "lon": -2.0110,
-    },
-    "SEND transition x Nottingham": {
-        "Place": "Nottingham",
-        "lat": 52.9548,
-        "lon": -1.1581,
-    },
-    "AI at the frontline x Barnsley": {
-        "Place": "Barnsley",
-        "lat": 53.5526,
-        "lon": -1.4797,
-    },
-}
-
-# Build a small DF for the map
-geo_rows = []
-for acc, info in ACCELERATOR_GEO.items():
-    geo_rows.append(
-        {
-            "Accelerator": acc,
-            "Place": info["Place"],
-            "lat": info["lat"],
-            "lon": info["lon"],
-        }
-    )
-geo_df = pd.DataFrame(geo_rows)
-
-SURVEY_WAVES = ["Wave 1", "Wave 2", "Wave 3"]
-
-# ONS-style diverging Likert palette (approximate)
-ONS_5 = [
-    "#CC1F24",  # strong negative
-    "#F46A25",  # small extent / disagree
-    "#D9D9D9",  # neutral
-    "#2CA3A3",  # great extent / agree
-    "#005F83",  # very great extent / strongly agree
-]
-ONS_DK = "#B3B3B3"  # Don't know / NA
-
-# Two batteries: metadata, questions, scales, colours
-BATTERIES = {
-    "Involvement in measuring outcomes": {
-        "stem": (
-            "Thinking about your **most recent project**, to what extent, if at all, "
-            "were you involved in the following activities?"
-        ),
-        "questions": [
-            "Developing ways to measure\nif project outcomes are being achieved",
-            "Gathering and analysing data\nto measure if project outcomes\nare being achieved",
-            "Assessing the quality of data\nused in measuring project outcomes",
-            "Using data to determine if\nlong-term strategic goals\nare being achieved",
-        ],
-        "likert_options": [
-            "1 = To no extent",
-            "2 = To a small extent",
-            "3 = To a moderate extent",
-            "4 = To a great extent",
-            "5 = To a very great extent",
-        ],
-        "scale_text": [
-            "1 = To no extent",
-            "2 = To a small extent",
-            "3 = To a moderate extent",
-            "4 = To a great extent",
-            "5 = To a very great extent",
-        ],
-        "palette": ONS_5,
-        "has_dk": False,
-    },
-    "Team learning and feedback culture": {
-        "stem": (
-            "Thinking about **your team**, to what extent do you agree or disagree "
-            "with the following statements?"
-        ),
-        "questions": [
-            "We are encouraged\nto learn from our mistakes.",
-            "We use feedback from those we serve\nto improve performance.",
-            "We integrate information\nand act intelligently on that information.",
-            "I believe we will use the insights\nfrom this survey to improve our work.",
-        ],
-        "likert_options": [
-            "1 = Strongly disagree",
-            "2 = Disagree",
-            "3 = Feel neutral",
-            "4 = Agree",
-            "5 = Strongly agree",
-            "6 = Don’t know / not applicable",
-        ],
-        "scale_text": [
-            "1 = Strongly disagree",
-            "2 = Disagree",
-            "3 = Feel neutral",
-            "4 = Agree",
-            "5 = Strongly agree",
-            "6 = Don’t know / not applicable",
-        ],
-        "palette": ONS_5 + [ONS_DK],
-        "has_dk": True,
-    },
-}
-
-OUTCOMES = ["Outcome 1", "Outcome 2", "Outcome 3", "Outcome 4"]
-
-QUAL_DOC_GROUPS = [
-    "Interviews",
-    "Weeknotes",
-    "Meeting notes",
-    "Observations",
-    "Programme documents",
-]
-
-QUAL_PHASES = [
-    "Set-up & inception",
-    "Early delivery",
-    "Mid-programme adaptation",
-    "Late programme / scaling",
-]
-
-QUAL_LEVELS = [
-    "Programme",
-    "Accelerator",
-    "Central government",
-    "Local government",
-    "Delivery partners",
-]
-
-QUAL_THEMATIC_GROUPS = [
-    "TLG Practices",
-    "Enablers",
-    "Barriers",
-    "Mechanisms of change",
-    "Outcomes",
-    "Sustainability & scaling",
-    "Governance & partnership",
-    "Contextual factors",
-]
-
-# -------------------------------------------------------------------
-# DUMMY SURVEY DATA (LIKERT DISTRIBUTIONS FOR BOTH BATTERIES)
-# -------------------------------------------------------------------
-likert_rows = []
-for acc in ACCELERATORS:
-    for wave in SURVEY_WAVES:
-        for battery_name, meta in BATTERIES.items():
-            questions = meta["questions"]
-            likert_opts = meta["likert_options"]
-            has_dk = meta["has_dk"]
-
-            for q in questions:
-                # Bias slightly towards middle / positive categories
-                probs = np.random.dirichlet([1.0] * len(likert_opts))
-                n = 80
-                counts = np.random.multinomial(n, probs)
-
-                for i, likert in enumerate(likert_opts, start=1):
-                    count = counts[i - 1]
-                    percent = count / n * 100
-
-                    # Don't-know category gets no score
-                    if has_dk and "Don’t know" in likert:
-                        score = np.nan
-                    else:
-                        score = i
-
-                    likert_rows.append(
-                        {
-                            "Accelerator": acc,
-                            "Wave": wave,
-                            "Battery": battery_name,
-                            "Question": q,
-                            "Likert": likert,
-                            "Score": score,  # may be NaN for DK
-                            "Count": count,
-                            "Percent": percent,
-                        }
-                    )
-
-survey_df = pd.DataFrame(likert_rows)
-survey_df["Weighted"] = survey_df["Score"] * survey_df["Percent"]
-
-# -------------------------------------------------------------------
-# DUMMY QUANT DATA (DiD-STYLE EFFECTS)
-# -------------------------------------------------------------------
-quant_rows = []
-for acc in ACCELERATORS:
-    for outcome in OUTCOMES:
-        eff = np.random.normal(0.05, 0.04)  # mean +5 ppts
-        se = np.random.uniform(0.01, 0.03)
-        ci_low = eff - 1.96 * se
-        ci_high = eff + 1.96 * se
-        p_val = np.random.uniform(0.01, 0.25)
-        quant_rows.append(
-            {
-                "Accelerator": acc,
-                "Outcome": outcome,
-                "Effect_size": eff,
-                "CI_low": ci_low,
-                "CI_high": ci_high,
-                "p_value": p_val,
-            }
-        )
-quant_df = pd.DataFrame(quant_rows)
-
-# -------------------------------------------------------------------
-# DUMMY QUAL DATA (CODED SEGMENTS BY GROUP)
-# -------------------------------------------------------------------
-qual_rows = []
-for acc in ACCELERATORS:
-    for doc in QUAL_DOC_GROUPS:
-        for phase in QUAL_PHASES:
-            for level in QUAL_LEVELS:
-                base = np.random.randint(5, 20)
-                for theme in QUAL_THEMATIC_GROUPS:
-                    mentions = base + np.random.randint(-5, 10)
-                    qual_rows.append(
-                        {
-                            "Accelerator": acc,
-                            "Document_group": doc,
-                            "Phase": phase,
-                            "Level": level,
-                            "Thematic_group": theme,
-                            "Mentions": max(0, mentions),
-                        }
-                    )
-qual_df = pd.DataFrame(qual_rows)
+# Global font and sidebar width
+configure_page("TLG Evaluation Dashboard", "📊", css=[FONT_CSS, SIDEBAR_CSS])
 
-# -------------------------------------------------------------------
-# DUMMY VfI DATA
-# -------------------------------------------------------------------
-vfi_rows = []
-for acc in ACCELERATORS:
-    cost = np.random.uniform(800, 1800)  # cost per participant
-    benefit = cost * np.random.uniform(0.8, 2.0)
-    bcr = benefit / cost
-    vfi_rows.append(
-        {
-            "Accelerator": acc,
-            "Cost_per_participant": cost,
-            "Benefit_per_participant": benefit,
-            "Benefit_cost_ratio": bcr,
-        }
-    )
-vfi_df = pd.DataFrame(vfi_rows)
+# Optional per-section profile (TLG_PROFILE=1 or ?profile=1)
+start_rerun()
 
 # -------------------------------------------------------------------
 # SIDEBAR
@@ -366,23 +59,7 @@ chart_color = st.sidebar.color_picker("Pick accent colour", "#2E86C1")
 # Theme toggle
 theme = st.sidebar.radio("Theme", ["Light", "Dark"])
 if theme == "Dark":
-    st.markdown(
-        """
-        <style>
-            .stApp {
-                background-color: #111111;
-                color: #F5F5F5;
-            }
-            [data-testid="stSidebar"] {
-                background-color: #222222;
-            }
-            h1, h2, h3, h4, h5, h6, p, label {
-                color: #F5F5F5;
-            }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(DARK_THEME_CSS, unsafe_allow_html=True)
 
 # Sidebar info
 st.sidebar.markdown(
@@ -418,96 +95,115 @@ st.markdown(
 st.markdown("---")
 
 # -------------------------------------------------------------------
-# MAP OF ENGLAND – TLG SITES
+# DUMMY DATA
 # -------------------------------------------------------------------
-st.markdown("### Where is this accelerator located?")
-
-map_df = geo_df.copy()
-map_df["Selected"] = map_df["Accelerator"] == selected_accelerator
-map_df["Marker_size"] = map_df["Selected"].map({True: 18, False: 10})
-map_df["Type"] = np.where(
-    map_df["Selected"],
-    "Selected accelerator team",
-    "Other TLG accelerator sites",
-)
-
-fig_map = px.scatter_mapbox(
-    map_df,
-    lat="lat",
-    lon="lon",
-    hover_name="Place",
-    hover_data={
-        "Accelerator": True,
-        "Type": False,
-        "Marker_size": False,
-        "lat": False,
-        "lon": False,
-    },
-    color="Type",
-    size="Marker_size",
-    size_max=20,
-    zoom=5,
-    center={"lat": 53.5, "lon": -2.0},
-    mapbox_style="open-street-map",
-    color_discrete_map={
-        "Selected accelerator team": "#005F83",      # highlight
-        "Other TLG accelerator sites": "#7FB3D5",    # background sites
-    },
-)
-
-fig_map.update_layout(
-    margin={"r": 0, "t": 0, "l": 0, "b": 0},
-    height=400,
-    legend_title="",
-)
+# numpy / pandas / plotly are first imported here, after the header has painted.
+# The registry is built once per process and shared read-only by all sessions;
+# session state only holds the widget selections.
+with section("data build"):
+    data = load_tlg_registry()
+# Integer key used by every fact table (tlg_data.ACCELERATOR_DIM)
+acc_id = data["accelerator_index"][selected_accelerator]
 
-# Custom hover note
-fig_map.update_traces(
-    hovertemplate=(
-        "<b>%{hovertext}</b><br>"  # Place name
-        "%{customdata[0]}<br>"     # Accelerator name
-        "This accelerator team is located here.<extra></extra>"
-    )
-)
+# -------------------------------------------------------------------
+# MAP OF ENGLAND – TLG SITES
+# -------------------------------------------------------------------
+with section("map"):
+    st.markdown("### Where is this accelerator located?")
 
-st.plotly_chart(fig_map, use_container_width=True)
+    fig_map = accelerator_map(data["accelerator_df"], selected_accelerator)
+    show_chart(fig_map, "map")
 
 # -------------------------------------------------------------------
 # TOP SUMMARY METRICS (DUMMY)
 # -------------------------------------------------------------------
-col1, col2, col3 = st.columns(3)
-
-# Survey metric: average Likert score (1–5) across batteries, questions & waves (excluding DK)
-acc_survey = survey_df[survey_df["Accelerator"] == selected_accelerator]
-mask = acc_survey["Score"].notna()
-mean_score = acc_survey.loc[mask, "Weighted"].sum() / acc_survey.loc[mask, "Percent"].sum()
-
-# Quant metric: share of outcomes with p < 0.05
-acc_quant = quant_df[quant_df["Accelerator"] == selected_accelerator]
-sig_share = (acc_quant["p_value"] < 0.05).mean() * 100
-
-# VfI metric
-acc_vfi = vfi_df[vfi_df["Accelerator"] == selected_accelerator].iloc[0]
-
-with col1:
-    st.metric("Mean survey score (1–5)", f"{mean_score:,.2f}")
-with col2:
-    st.metric("% outcomes with p < 0.05", f"{sig_share:,.0f}%")
-with col3:
-    st.metric("Benefit–cost ratio", f"{acc_vfi['Benefit_cost_ratio']:,.2f}x")
+with section("KPI row"):
+    col1, col2, col3 = st.columns(3)
+
+    # Precomputed per accelerator (tlg_data.synthesis_table):
+    # - survey: average Likert score (1–5) across batteries, questions & waves (excluding DK)
+    # - quant: share of outcomes with p < 0.05
+    # - VfI: cost, benefit and benefit–cost ratio
+    acc_kpis = data["synthesis"].loc[acc_id]
+    mean_score = acc_kpis["Mean_score"]
+    sig_share = acc_kpis["Sig_share"]
+
+    with col1:
+        st.metric("Mean survey score (1–5)", f"{mean_score:,.2f}")
+    with col2:
+        st.metric("% outcomes with p < 0.05", f"{sig_share:,.0f}%")
+    with col3:
+        st.metric("Benefit–cost ratio", f"{acc_kpis['Benefit_cost_ratio']:,.2f}x")
 
 # -------------------------------------------------------------------
 # TABS FOR STRANDS
 # -------------------------------------------------------------------
-tab_qual, tab_survey, tab_quant, tab_vfi = st.tabs(
-    ["📋 Qualitative evaluation", "📊 Longitudinal Survey", "📈 Quantitative impact", "💷 Value for Investment"]
+tab_overview, tab_qual, tab_survey, tab_quant, tab_vfi = st.tabs(
+    [
+        "🧭 Programme overview",
+        "📋 Qualitative evaluation",
+        "📊 Longitudinal Survey",
+        "📈 Quantitative impact",
+        "💷 Value for Investment",
+    ]
 )
 
+# ------------------------ OVERVIEW TAB ------------------------------
+with tab_overview, section("tab: overview"):
+    st.subheader("Programme overview – all strands, all accelerators")
+
+    # Wide synthesis table precomputed once (tlg_data.synthesis_table)
+    sort_columns = {
+        "Mean survey score": "Mean_score",
+        f"Survey score change ({SURVEY_WAVES[0]} → {SURVEY_WAVES[-1]})": "Score_change",
+        "% outcomes with p < 0.05": "Sig_share",
+        "Mean effect (ppts)": "Mean_effect_ppts",
+        "Coded segments": "Coded_segments",
+        "Benefit–cost ratio": "Benefit_cost_ratio",
+    }
+    # Single-wave datasets have no change columns
+    sort_columns = {
+        label: col for label, col in sort_columns.items() if col in data["synthesis"].columns
+    }
+    col_o1, col_o2 = st.columns([3, 1])
+    with col_o1:
+        sort_label = st.selectbox("Sort accelerators by", list(sort_columns))
+    with col_o2:
+        highest_first = st.checkbox("Highest first", value=True)
+
+    with section("overview sort"):
+        overview = data["synthesis"].sort_values(
+            sort_columns[sort_label], ascending=not highest_first, kind="stable"
+        )
+        rank = overview.index.get_loc(acc_id) + 1
+
+    st.caption(f"{selected_accelerator} is {rank} of {len(overview)} by {sort_label.lower()}.")
+    st.dataframe(
+        overview,
+        hide_index=True,
+        column_config={
+            "Mean_score": st.column_config.NumberColumn("Mean score (1–5)", format="%.2f"),
+            "Score_change": st.column_config.NumberColumn(
+                f"Score change {SURVEY_WAVES[0]} → {SURVEY_WAVES[-1]}", format="%+.2f"
+            ),
+            "Significant_shifts": st.column_config.NumberColumn("Significant question shifts"),
+            "Mean_effect_ppts": st.column_config.NumberColumn("Mean effect (ppts)", format="%.1f"),
+            "Sig_share": st.column_config.ProgressColumn(
+                "% outcomes p < 0.05", format="%.0f%%", min_value=0, max_value=100
+            ),
+            "Coded_segments": st.column_config.NumberColumn("Coded segments"),
+            "Top_theme": "Most coded theme",
+            "Cost_per_participant": st.column_config.NumberColumn("Cost (£)", format="£%.0f"),
+            "Benefit_per_participant": st.column_config.NumberColumn("Benefit (£)", format="£%.0f"),
+            "Benefit_cost_ratio": st.column_config.NumberColumn("BCR", format="%.2fx"),
+        },
+    )
+
 # ------------------------ QUALITATIVE TAB ---------------------------
-with tab_qual:
+with tab_qual, section("tab: qualitative"):
     st.subheader("Qualitative evaluation – codebook view")
 
-    acc_qual = qual_df[qual_df["Accelerator"] == selected_accelerator].copy()
+    acc_qual = accelerator_rows(data, "qual_df", selected_accelerator)
 
     # Filters mimicking infrastructure codes
     col_q1, col_q2 = st.columns(2)
@@ -522,31 +218,70 @@ with tab_qual:
             ["All"] + QUAL_PHASES,
         )
 
-    if selected_doc != "All":
-        acc_qual = acc_qual[acc_qual["Document_group"] == selected_doc]
-    if selected_phase != "All":
-        acc_qual = acc_qual[acc_qual["Phase"] == selected_phase]
+    with section("qual filter + groupby"):
+        if selected_doc != "All":
+            acc_qual = acc_qual[acc_qual["Document_group"] == selected_doc]
+        if selected_phase != "All":
+            acc_qual = acc_qual[acc_qual["Phase"] == selected_phase]
 
-    thematic_summary = (
-        acc_qual.groupby("Thematic_group", as_index=False)["Mentions"]
-        .sum()
-        .sort_values("Mentions", ascending=False)
-    )
+        thematic_summary = (
+            acc_qual.groupby("Thematic_group", as_index=False)["Mentions"]
+            .sum()
+            .sort_values("Mentions", ascending=False)
+        )
 
-    fig_qual = px.bar(
+    fig_qual = accent_bar(
         thematic_summary,
-        x="Thematic_group",
-        y="Mentions",
-        title="Coded segments by thematic group (dummy)",
+        "Thematic_group",
+        "Mentions",
+        "Coded segments by thematic group (dummy)",
+        chart_color,
         text_auto=True,
-        color="Thematic_group",
-        color_discrete_sequence=[chart_color],
     )
     fig_qual.update_layout(
         xaxis_title="Thematic group",
         yaxis_title="Number of coded segments",
     )
-    st.plotly_chart(fig_qual, use_container_width=True)
+    show_chart(fig_qual, "qualitative")
+
+    # Ranked excerpts from the coded segments (qual_search.py), within the
+    # document group / phase filters above
+    st.markdown("#### Search coded segments")
+    col_s1, col_s2 = st.columns([3, 1])
+    with col_s1:
+        query = st.text_input("Search excerpts", placeholder="e.g. data sharing barriers")
+    with col_s2:
+        all_accelerators = st.checkbox("Search all accelerators", value=False)
+    if query:
+        with section("qual search"):
+            hits, n_matches = search_segments(
+                query,
+                k=25,
+                Accelerator_id=None if all_accelerators else acc_id,
+                Document_group=None if selected_doc == "All" else selected_doc,
+                Phase=None if selected_phase == "All" else selected_phase,
+            )
+        st.caption(f"{n_matches:,} matching segments – showing the top {len(hits)}")
+        st.dataframe(with_accelerator_names(data, hits), hide_index=True)
+
+    # Documents in which two thematic groups are both coded (qual_cooccurrence.py),
+    # within the phase filter above
+    st.markdown("#### Theme co-occurrence")
+    selected_level = st.selectbox("Level of analysis", ["All"] + QUAL_LEVELS)
+    with section("co-occurrence"):
+        cooc = load_cooccurrence(
+            acc_id,
+            None if selected_level == "All" else selected_level,
+            None if selected_phase == "All" else selected_phase,
+        )
+    fig_cooc = cooccurrence_heatmap(
+        cooc["matrix"],
+        cooc["labels"],
+        f"Documents coding both thematic groups – {cooc['documents']:,} documents (dummy)",
+    )
+    show_chart(fig_cooc, "co-occurrence")
+    with st.expander("Most frequent theme pairs"):
+        st.dataframe(cooc["pairs"].round({"Jaccard": 2}), hide_index=True)
 
     st.markdown("#### How this reflects the qualitative approach")
     st.markdown(
@@ -562,7 +297,7 @@ with tab_qual:
     )
 
 # ------------------------ SURVEY TAB (LIKERT) -----------------------
-with tab_survey:
+with tab_survey, section("tab: survey"):
     st.subheader("Understanding of ways of working")
 
     # Wave selector INSIDE the tab
@@ -582,23 +317,10 @@ with tab_survey:
     likert_opts = meta["likert_options"]
     palette = meta["palette"]
 
-    wave_df = survey_df[
-        (survey_df["Accelerator"] == selected_accelerator)
-        & (survey_df["Wave"] == selected_wave)
-        & (survey_df["Battery"] == selected_battery)
-    ].copy()
-
-    # Ordering for axes
-    wave_df["Likert"] = pd.Categorical(
-        wave_df["Likert"],
-        categories=likert_opts,
-        ordered=True,
-    )
-    wave_df["Question"] = pd.Categorical(
-        wave_df["Question"],
-        categories=questions,
-        ordered=True,
-    )
+    # Precomputed (question x option) percentages for this accelerator and wave
+    percent = data["likert"][selected_battery][
+        acc_id, SURVEY_WAVES.index(selected_wave)
+    ]
 
     # Question stem + scale text
     st.markdown(f"**Question stem**  \n{meta['stem']}")
@@ -606,52 +328,15 @@ with tab_survey:
     for line in meta["scale_text"]:
         st.markdown(f"- {line}")
 
-    # Horizontal stacked bar chart, ONS-style
-    fig_likert = px.bar(
-        wave_df,
-        x="Percent",
-        y="Question",
-        color="Likert",
-        orientation="h",
-        barmode="stack",
-        title=f"Distribution of responses by question – {selected_battery}, {selected_wave} (dummy)",
-        color_discrete_sequence=palette,
-        category_orders={
-            "Likert": likert_opts,
-            "Question": list(reversed(questions)),
-        },
-    )
-
-    fig_likert.update_layout(
-        xaxis_title="Percent of respondents",
-        yaxis_title="",
-        xaxis=dict(
-            range=[0, 100],
-            ticks="outside",
-            tick0=0,
-            dtick=20,
-            showgrid=True,
-            gridcolor="#E5E5E5",
-            zeroline=False,
-        ),
-        yaxis=dict(showgrid=False),
-        legend_title="Response",
-        plot_bgcolor="#FFFFFF",
-        paper_bgcolor="#FFFFFF",
-        bargap=0.25,
-        margin=dict(l=260, r=40, t=80, b=60),
-    )
-
-    # Data labels inside bars
-    fig_likert.update_traces(
-        texttemplate="%{x:.0f}%",
-        textposition="inside",
-        insidetextanchor="middle",
-        textfont=dict(color="#FFFFFF", size=11),
-        hovertemplate="<b>%{y}</b><br>%{legendgroup}<br>%{x:.1f}%<extra></extra>",
+    fig_likert = likert_bar(
+        percent,
+        questions,
+        likert_opts,
+        palette,
+        f"Distribution of responses by question – {selected_battery}, {selected_wave} (dummy)",
     )
 
-    st.plotly_chart(fig_likert, use_container_width=True)
+    show_chart(fig_likert, "likert")
 
     st.markdown(
         """
@@ -663,24 +348,69 @@ with tab_survey:
         """
     )
 
+    # Wave-over-wave change, precomputed for every accelerator (survey_change.py);
+    # needs at least two waves
+    wave_pairs = [(a, b) for i, a in enumerate(SURVEY_WAVES) for b in SURVEY_WAVES[i + 1:]]
+    if wave_pairs:
+        st.markdown("#### Change between waves")
+        wave_pair = st.selectbox(
+            "Compare waves",
+            wave_pairs,
+            # First to last wave by default, as in the overview's score change
+            index=wave_pairs.index((SURVEY_WAVES[0], SURVEY_WAVES[-1])),
+            format_func=lambda pair: f"{pair[0]} → {pair[1]}",
+        )
+        with section("wave change slice"):
+            change_df = data["change_df"]
+            in_pair = (
+                (change_df["Battery"] == selected_battery)
+                & (change_df["Wave_from"] == wave_pair[0])
+                & (change_df["Wave_to"] == wave_pair[1])
+            )
+            pair_changes = change_df[in_pair]
+            acc_changes = pair_changes[pair_changes["Accelerator_id"] == acc_id]
+
+        fig_change = wave_dumbbell(
+            acc_changes,
+            questions,
+            *wave_pair,
+            f"Mean score by question – {wave_pair[0]} to {wave_pair[1]} (dummy)",
+        )
+        show_chart(fig_change, "wave change")
+
+        significant = pair_changes[pair_changes["p_value"] < 0.05]
+        st.markdown(
+            f"**Across all accelerators:** {len(significant):,} of {len(pair_changes):,} "
+            "question means changed significantly (p < 0.05, not adjusted for multiple comparisons)."
+        )
+        st.dataframe(
+            with_accelerator_names(
+                data,
+                significant.reindex(significant["Mean_diff"].abs().sort_values(ascending=False).index)[
+                    ["Accelerator_id", "Question", "Mean_from", "Mean_to", "Mean_diff", "p_value",
+                     "Distribution_shift", "Chi2_p"]
+                ].round(3),
+            ),
+            hide_index=True,
+        )
+
 # ------------------------ QUANT TAB -------------------------------
-with tab_quant:
+with tab_quant, section("tab: quant"):
     st.subheader("Quantitative impact (dummy DiD-style estimates)")
 
-    acc_quant = quant_df[quant_df["Accelerator"] == selected_accelerator].copy()
+    acc_quant = accelerator_rows(data, "quant_df", selected_accelerator).copy()
     acc_quant["Effect (ppts)"] = acc_quant["Effect_size"] * 100
 
-    fig_quant = px.bar(
+    fig_quant = accent_bar(
         acc_quant,
-        x="Outcome",
-        y="Effect (ppts)",
-        title="Estimated impact by outcome (dummy)",
+        "Outcome",
+        "Effect (ppts)",
+        "Estimated impact by outcome (dummy)",
+        chart_color,
         text="Effect (ppts)",
-        color="Outcome",
-        color_discrete_sequence=[chart_color],
     )
     fig_quant.update_layout(yaxis_title="Effect size (percentage points)")
-    st.plotly_chart(fig_quant, use_container_width=True)
+    show_chart(fig_quant, "quant")
 
     st.markdown("#### Effect estimates with confidence intervals (dummy)")
     st.dataframe(
@@ -699,12 +429,12 @@ with tab_quant:
     )
 
 # ------------------------ VFI TAB -------------------------------
-with tab_vfi:
+with tab_vfi, section("tab: VfI"):
     st.subheader("Value for Investment (dummy)")
 
-    cost = acc_vfi["Cost_per_participant"]
-    benefit = acc_vfi["Benefit_per_participant"]
-    bcr = acc_vfi["Benefit_cost_ratio"]
+    cost = acc_kpis["Cost_per_participant"]
+    benefit = acc_kpis["Benefit_per_participant"]
+    bcr = acc_kpis["Benefit_cost_ratio"]
 
     c1, c2, c3 = st.columns(3)
     with c1:
@@ -714,23 +444,20 @@ with tab_vfi:
     with c3:
         st.metric("Benefit–cost ratio", f"{bcr:,.2f}x")
 
-    vfi_plot_df = pd.DataFrame(
-        {
-            "Type": ["Cost per participant", "Benefit per participant"],
-            "Amount": [cost, benefit],
-        }
-    )
-    fig_vfi = px.bar(
+    vfi_plot_df = {
+        "Type": ["Cost per participant", "Benefit per participant"],
+        "Amount": [cost, benefit],
+    }
+    fig_vfi = accent_bar(
         vfi_plot_df,
-        x="Type",
-        y="Amount",
+        "Type",
+        "Amount",
+        "Cost vs benefit per participant (dummy)",
+        chart_color,
         text_auto=True,
-        title="Cost vs benefit per participant (dummy)",
-        color="Type",
-        color_discrete_sequence=[chart_color],
     )
     fig_vfi.update_yaxes(title="£ per participant")
-    st.plotly_chart(fig_vfi, use_container_width=True)
+    show_chart(fig_vfi, "VfI")
 
     st.markdown(
         """
@@ -767,3 +494,6 @@ st.markdown(
     """,
     unsafe_allow_html=True,
 )
+
+# Debug sidebar panel (only when profiling is on)
+render_debug_panel()
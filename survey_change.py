@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+from scipy.special import chdtrc
+
+from stats_common import Z_95, two_sided_p
+from tlg_data import BATTERIES, SURVEY_WAVES
+
+
+# ---------------------------------------------------------
+# HELPERS
+# ---------------------------------------------------------
+def chi2_sf(stat, df):
+    # Upper-tail chi-square probability, vectorised. chdtrc is what
+    # scipy.stats.chi2.sf evaluates, without importing scipy.stats (~1 s).
+    # Undefined (NaN) for df = 0, i.e. only one option answered in either wave.
+    stat = np.asarray(stat, dtype=float)
+    df = np.asarray(df, dtype=float)
+    return np.where(df > 0, chdtrc(np.maximum(df, 1), stat), np.nan)
+
+
+def wave_pairs(waves=SURVEY_WAVES):
+    # Every earlier -> later pair of waves, e.g. Wave 1 -> Wave 3
+    return [(i, j) for i in range(len(waves)) for j in range(i + 1, len(waves))]
+
+
+def _score_moments(counts, scores):
+    # Mean Likert score and its standard error over the scored options (DK excluded)
+    scored = ~np.isnan(scores)
+    c, s = counts[..., scored], scores[scored]
+    n = c.sum(axis=-1)
+    mean = (c * s).sum(axis=-1) / n
+    var = (c * (s - mean[..., None]) ** 2).sum(axis=-1) / (n - 1)
+    return mean, np.sqrt(var / n)
+
+
+# ---------------------------------------------------------
+# CHANGE ENGINE
+# ---------------------------------------------------------
+def wave_changes(counts_by_battery):
+    # Shifts between every pair of waves for all accelerators, batteries and
+    # questions at once. counts_by_battery maps battery -> counts shaped
+    # (accelerator, wave, question, option), see tlg_data.likert_matrices.
+    #   - mean score: difference in means, z-test with the two standard errors
+    #   - distribution: total variation distance (ppts) and a 2 x K chi-square
+    #     test of homogeneity over the options answered in either wave
+    pairs = wave_pairs()
+    w_from = np.array([i for i, _ in pairs], dtype=int)
+    w_to = np.array([j for _, j in pairs], dtype=int)
+    frames = []
+    for battery, counts in counts_by_battery.items():
+        meta = BATTERIES[battery]
+        scores = np.array(
+            [np.nan if meta["has_dk"] and "Don’t know" in opt else i
+             for i, opt in enumerate(meta["likert_options"], start=1)],
+            dtype=float,
+        )
+        mean, se = _score_moments(counts, scores)
+
+        # (accelerator, pair, question[, option])
+        a, b = counts[:, w_from], counts[:, w_to]
+        diff = mean[:, w_to] - mean[:, w_from]
+        diff_se = np.sqrt(se[:, w_to] ** 2 + se[:, w_from] ** 2)
+        z = diff / diff_se
+
+        n_a = a.sum(axis=-1, keepdims=True)
+        n_b = b.sum(axis=-1, keepdims=True)
+        shift = 50 * np.abs(b / n_b - a / n_a).sum(axis=-1)
+
+        col = a + b
+        total = n_a + n_b
+        with np.errstate(divide="ignore", invalid="ignore"):
+            terms = (a - n_a * col / total) ** 2 / (n_a * col / total) + (
+                b - n_b * col / total
+            ) ** 2 / (n_b * col / total)
+        chi2 = np.where(col > 0, terms, 0.0).sum(axis=-1)
+        chi2_df = (col > 0).sum(axis=-1) - 1
+
+        n_acc, n_pairs, n_q = diff.shape
+        waves = np.asarray(SURVEY_WAVES)
+        frames.append(
+            pd.DataFrame(
+                {
+                    "Accelerator_id": np.repeat(np.arange(n_acc), n_pairs * n_q),
+                    "Battery": battery,
+                    "Question": np.tile(meta["questions"], n_acc * n_pairs),
+                    "Wave_from": np.tile(np.repeat(waves[w_from], n_q), n_acc),
+                    "Wave_to": np.tile(np.repeat(waves[w_to], n_q), n_acc),
+                    "Mean_from": mean[:, w_from].ravel(),
+                    "Mean_to": mean[:, w_to].ravel(),
+                    "Mean_diff": diff.ravel(),
+                    "Mean_diff_ci": (Z_95 * diff_se).ravel(),
+                    "z": z.ravel(),
+                    "p_value": two_sided_p(z).ravel(),
+                    "Distribution_shift": shift.ravel(),
+                    "Chi2": chi2.ravel(),
+                    "Chi2_df": chi2_df.ravel(),
+                    "Chi2_p": chi2_sf(chi2, chi2_df).ravel(),
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
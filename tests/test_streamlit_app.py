@@ -0,0 +1,29 @@
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "streamlit_app.py")
+
+
+@pytest.fixture(scope="module")
+def app():
+    at = AppTest.from_file(APP, default_timeout=300).run()
+    assert not at.exception
+    return at
+
+
+# Zero-hit queries: "the" is a stopword, "zzz" and "barriers" are not in the
+# dummy vocabulary. Each must render an empty table, not raise.
+@pytest.mark.parametrize("query", ["zzz", "the", "barriers"])
+def test_search_without_hits(app, query):
+    search = next(w for w in app.text_input if w.label == "Search excerpts")
+    search.set_value(query).run()
+    assert not app.exception
+
+
+def test_search_with_hits(app):
+    search = next(w for w in app.text_input if w.label == "Search excerpts")
+    search.set_value("data sharing").run()
+    assert not app.exception
+    assert any(len(table.value) for table in app.dataframe)
@@ -0,0 +1,565 @@
+import json
+import os
+from types import MappingProxyType
+
+from dashboard_core import ONS_5, ONS_DK
+
+# Accelerator definitions and dummy evaluation data for streamlit_app.py.
+# The definitions are plain Python so the app can build its sidebar and header
+# before build_dummy_data() pulls in numpy and pandas.
+
+# -------------------------------------------------------------------
+# CONSTANTS / DUMMY DATA DEFINITIONS
+# -------------------------------------------------------------------
+# Accelerator dimension: name, place and approximate coordinates of each
+# actual accelerator. The position in this list is the integer Accelerator_id
+# that every fact table carries instead of the name.
+ACCELERATOR_DIM = [
+    ("Best Start in Life (BSIL) x Northumberland", "Northumberland", 55.1667, -2.0000),
+    ("Best Start in Life (BSIL) x Manchester", "Manchester", 53.4808, -2.2426),
+    ("Neighbourhood health x Plymouth", "Plymouth", 50.3755, -4.1427),
+    ("Neighbourhood health x Liverpool", "Liverpool", 53.4084, -2.9916),
+    ("Neighbourhood health x Essex", "Essex (Chelmsford)", 51.7360, 0.4790),
+    ("Economic inactivity x Wakefield", "Wakefield", 53.6829, -1.4969),
+    ("Violence Against Women and Girls (VAWG) x London", "London", 51.5074, -0.1278),
+    ("SEND transitions x Sandwell", "Sandwell", 52.5050, -2.0110),
+    ("SEND transition x Nottingham", "Nottingham", 52.9548, -1.1581),
+    ("AI at the frontline x Barnsley", "Barnsley", 53.5526, -1.4797),
+]
+
+# Kept apart so tlg_synth.py can seed generated datasets with the real
+# accelerators even when TLG_DATA_DIR has replaced ACCELERATOR_DIM below
+REAL_ACCELERATOR_DIM = tuple(ACCELERATOR_DIM)
+
+SURVEY_WAVES = ["Wave 1", "Wave 2", "Wave 3"]
+
+# Generated dataset to load instead of the built-in dummy data (tlg_synth.py).
+# Its manifest replaces the accelerator dimension and the survey waves.
+DATA_DIR = os.environ.get("TLG_DATA_DIR")
+if DATA_DIR:
+    with open(os.path.join(DATA_DIR, "manifest.json"), encoding="utf-8") as _fh:
+        DATA_MANIFEST = json.load(_fh)
+    ACCELERATOR_DIM = [tuple(row) for row in DATA_MANIFEST["accelerators"]]
+    SURVEY_WAVES = DATA_MANIFEST["waves"]
+
+ACCELERATORS = [name for name, *_ in ACCELERATOR_DIM]
+
+# Two batteries: metadata, questions, scales, colours
+BATTERIES = {
+    "Involvement in measuring outcomes": {
+        "stem": (
+            "Thinking about your **most recent project**, to what extent, if at all, "
+            "were you involved in the following activities?"
+        ),
+        "questions": [
+            "Developing ways to measure\nif project outcomes are being achieved",
+            "Gathering and analysing data\nto measure if project outcomes\nare being achieved",
+            "Assessing the quality of data\nused in measuring project outcomes",
+            "Using data to determine if\nlong-term strategic goals\nare being achieved",
+        ],
+        "likert_options": [
+            "1 = To no extent",
+            "2 = To a small extent",
+            "3 = To a moderate extent",
+            "4 = To a great extent",
+            "5 = To a very great extent",
+        ],
+        "scale_text": [
+            "1 = To no extent",
+            "2 = To a small extent",
+            "3 = To a moderate extent",
+            "4 = To a great extent",
+            "5 = To a very great extent",
+        ],
+        "palette": ONS_5,
+        "has_dk": False,
+    },
+    "Team learning and feedback culture": {
+        "stem": (
+            "Thinking about **your team**, to what extent do you agree or disagree "
+            "with the following statements?"
+        ),
+        "questions": [
+            "We are encouraged\nto learn from our mistakes.",
+            "We use feedback from those we serve\nto improve performance.",
+            "We integrate information\nand act intelligently on that information.",
+            "I believe we will use the insights\nfrom this survey to improve our work.",
+        ],
+        "likert_options": [
+            "1 = Strongly disagree",
+            "2 = Disagree",
+            "3 = Feel neutral",
+            "4 = Agree",
+            "5 = Strongly agree",
+            "6 = Don’t know / not applicable",
+        ],
+        "scale_text": [
+            "1 = Strongly disagree",
+            "2 = Disagree",
+            "3 = Feel neutral",
+            "4 = Agree",
+            "5 = Strongly agree",
+            "6 = Don’t know / not applicable",
+        ],
+        "palette": ONS_5 + [ONS_DK],
+        "has_dk": True,
+    },
+}
+
+OUTCOMES = ["Outcome 1", "Outcome 2", "Outcome 3", "Outcome 4"]
+
+QUAL_DOC_GROUPS = [
+    "Interviews",
+    "Weeknotes",
+    "Meeting notes",
+    "Observations",
+    "Programme documents",
+]
+
+QUAL_PHASES = [
+    "Set-up & inception",
+    "Early delivery",
+    "Mid-programme adaptation",
+    "Late programme / scaling",
+]
+
+QUAL_LEVELS = [
+    "Programme",
+    "Accelerator",
+    "Central government",
+    "Local government",
+    "Delivery partners",
+]
+
+QUAL_THEMATIC_GROUPS = [
+    "TLG Practices",
+    "Enablers",
+    "Barriers",
+    "Mechanisms of change",
+    "Outcomes",
+    "Sustainability & scaling",
+    "Governance & partnership",
+    "Contextual factors",
+]
+
+# Documents per accelerator x document group x phase in the dummy segments
+QUAL_DOCS_PER_GROUP = 12
+# Seed of build_segments' own random stream
+QUAL_SEGMENT_SEED = 7
+
+# Phrase banks for dummy coded segment text (build_segments): each segment is
+# "<actor> <finding> <detail>" with the finding drawn from its thematic group
+QUAL_SEGMENT_ACTORS = [
+    "The accelerator team",
+    "Frontline staff",
+    "Local authority colleagues",
+    "Delivery partners",
+    "The programme lead",
+    "Service users",
+    "Central government officials",
+    "Team members",
+]
+
+QUAL_SEGMENT_FINDINGS = {
+    "TLG Practices": [
+        "ran rapid test-and-learn cycles on",
+        "used weekly retrospectives to review",
+        "prototyped small changes to",
+        "co-designed experiments around",
+    ],
+    "Enablers": [
+        "credited senior sponsorship for progress on",
+        "found protected time essential for",
+        "relied on shared data access to improve",
+        "pointed to trusted relationships behind",
+    ],
+    "Barriers": [
+        "struggled with information governance around",
+        "reported staff turnover slowing",
+        "described procurement rules blocking",
+        "lacked analytical capacity for",
+    ],
+    "Mechanisms of change": [
+        "described growing confidence in",
+        "noticed a shift in attitudes towards",
+        "saw feedback loops reshape",
+        "linked new routines to improvements in",
+    ],
+    "Outcomes": [
+        "observed reduced waiting times in",
+        "reported better engagement with",
+        "measured early improvements to",
+        "saw fewer repeat referrals in",
+    ],
+    "Sustainability & scaling": [
+        "planned to embed the approach in",
+        "sought recurrent funding for",
+        "shared learning with neighbouring areas about",
+        "wrote a handover plan for",
+    ],
+    "Governance & partnership": [
+        "set up a joint steering group for",
+        "agreed clearer decision rights over",
+        "aligned partner priorities on",
+        "escalated risks about",
+    ],
+    "Contextual factors": [
+        "noted budget pressures affecting",
+        "linked winter demand to changes in",
+        "described political turnover disrupting",
+        "highlighted local labour market conditions shaping",
+    ],
+}
+
+QUAL_SEGMENT_DETAILS = [
+    "early years referrals",
+    "hospital discharge pathways",
+    "outcome measurement",
+    "data sharing agreements",
+    "family hubs",
+    "employment support",
+    "school transition plans",
+    "digital tools on the frontline",
+    "community outreach",
+    "case management workflows",
+    "safeguarding practice",
+    "resident feedback",
+]
+
+
+def build_dummy_data():
+    if DATA_DIR:
+        from tlg_synth import read_dataset
+
+        return read_dataset(DATA_DIR)
+
+    import numpy as np
+    import pandas as pd
+
+    np.random.seed(42)
+
+    # Accelerator dimension (also drives the map)
+    accelerator_df = pd.DataFrame(ACCELERATOR_DIM, columns=["Accelerator", "Place", "lat", "lon"])
+    accelerator_df.insert(0, "Accelerator_id", np.arange(len(accelerator_df)))
+
+    # Dummy survey data (Likert distributions for both batteries)
+    likert_rows = []
+    for acc_id in range(len(ACCELERATORS)):
+        for wave in SURVEY_WAVES:
+            for battery_name, meta in BATTERIES.items():
+                questions = meta["questions"]
+                likert_opts = meta["likert_options"]
+                has_dk = meta["has_dk"]
+
+                for q in questions:
+                    # Bias slightly towards middle / positive categories
+                    probs = np.random.dirichlet([1.0] * len(likert_opts))
+                    n = 80
+                    counts = np.random.multinomial(n, probs)
+
+                    for i, likert in enumerate(likert_opts, start=1):
+                        count = counts[i - 1]
+                        percent = count / n * 100
+
+                        # Don't-know category gets no score
+                        if has_dk and "Don’t know" in likert:
+                            score = np.nan
+                        else:
+                            score = i
+
+                        likert_rows.append(
+                            {
+                                "Accelerator_id": acc_id,
+                                "Wave": wave,
+                                "Battery": battery_name,
+                                "Question": q,
+                                "Likert": likert,
+                                "Score": score,  # may be NaN for DK
+                                "Count": count,
+                                "Percent": percent,
+                            }
+                        )
+
+    survey_df = pd.DataFrame(likert_rows)
+    survey_df["Weighted"] = survey_df["Score"] * survey_df["Percent"]
+
+    # Dummy quant data (DiD-style effects)
+    quant_rows = []
+    for acc_id in range(len(ACCELERATORS)):
+        for outcome in OUTCOMES:
+            eff = np.random.normal(0.05, 0.04)  # mean +5 ppts
+            se = np.random.uniform(0.01, 0.03)
+            ci_low = eff - 1.96 * se
+            ci_high = eff + 1.96 * se
+            p_val = np.random.uniform(0.01, 0.25)
+            quant_rows.append(
+                {
+                    "Accelerator_id": acc_id,
+                    "Outcome": outcome,
+                    "Effect_size": eff,
+                    "CI_low": ci_low,
+                    "CI_high": ci_high,
+                    "p_value": p_val,
+                }
+            )
+    quant_df = pd.DataFrame(quant_rows)
+
+    # Dummy qual data (coded segments by group)
+    qual_rows = []
+    for acc_id in range(len(ACCELERATORS)):
+        for doc in QUAL_DOC_GROUPS:
+            for phase in QUAL_PHASES:
+                for level in QUAL_LEVELS:
+                    base = np.random.randint(5, 20)
+                    for theme in QUAL_THEMATIC_GROUPS:
+                        mentions = base + np.random.randint(-5, 10)
+                        qual_rows.append(
+                            {
+                                "Accelerator_id": acc_id,
+                                "Document_group": doc,
+                                "Phase": phase,
+                                "Level": level,
+                                "Thematic_group": theme,
+                                "Mentions": max(0, mentions),
+                            }
+                        )
+    qual_df = pd.DataFrame(qual_rows)
+
+    # Dummy VfI data
+    vfi_rows = []
+    for acc_id in range(len(ACCELERATORS)):
+        cost = np.random.uniform(800, 1800)  # cost per participant
+        benefit = cost * np.random.uniform(0.8, 2.0)
+        bcr = benefit / cost
+        vfi_rows.append(
+            {
+                "Accelerator_id": acc_id,
+                "Cost_per_participant": cost,
+                "Benefit_per_participant": benefit,
+                "Benefit_cost_ratio": bcr,
+            }
+        )
+    vfi_df = pd.DataFrame(vfi_rows)
+
+    return {
+        "accelerator_df": accelerator_df,
+        "survey_df": survey_df,
+        "quant_df": quant_df,
+        "qual_df": qual_df,
+        "vfi_df": vfi_df,
+    }
+
+
+def build_registry():
+    # Read-only data shared by every session (dashboard_core.load_tlg_registry):
+    # the dummy frames, the cross-strand synthesis table and the row positions
+    # of each accelerator in each fact table, so a rerun only slices and never
+    # copies the whole data set. Callers must not modify the frames in place.
+    from survey_change import wave_changes
+
+    data = build_dummy_data()
+    survey_df = data["survey_df"]
+    # Wave-over-wave shifts for every accelerator, battery and question
+    data["change_df"] = wave_changes(likert_matrices(survey_df, "Count"))
+
+    rows = {
+        name: MappingProxyType(df.groupby("Accelerator_id", sort=False).indices)
+        for name, df in data.items()
+        if name != "accelerator_df"
+    }
+    return MappingProxyType(
+        {
+            **data,
+            "synthesis": synthesis_table(data),
+            "rows": MappingProxyType(rows),
+            "accelerator_index": MappingProxyType({acc: i for i, acc in enumerate(ACCELERATORS)}),
+            "likert": MappingProxyType(likert_matrices(survey_df)),
+        }
+    )
+
+
+def synthesis_table(data):
+    # One wide row per accelerator (indexed by Accelerator_id) with the headline
+    # figures of every strand, aggregated with integer bincounts on the key:
+    # - survey: mean Likert score excluding DK, and the average change and
+    #   number of significant question shifts from the first to the last wave
+    # - quant: mean effect and share of outcomes with p < 0.05
+    # - qual: coded segments and the most coded thematic group
+    # - VfI: cost, benefit and benefit–cost ratio
+    import numpy as np
+    import pandas as pd
+
+    n = len(ACCELERATORS)
+
+    def total(df, weights=None, mask=None):
+        ids = df["Accelerator_id"].to_numpy()
+        weights = None if weights is None else np.asarray(weights, dtype=float)
+        if mask is not None:
+            ids = ids[mask]
+            weights = None if weights is None else weights[mask]
+        return np.bincount(ids, weights, minlength=n)
+
+    survey_df = data["survey_df"]
+    scored = survey_df["Score"].notna().to_numpy()
+    mean_score = total(survey_df, survey_df["Weighted"], scored) / total(
+        survey_df, survey_df["Percent"], scored
+    )
+
+    # No change columns for a single-wave dataset (tlg_synth.py --waves 1)
+    changes = {}
+    if len(SURVEY_WAVES) > 1:
+        change_df = data["change_df"]
+        first_last = (
+            (change_df["Wave_from"] == SURVEY_WAVES[0]) & (change_df["Wave_to"] == SURVEY_WAVES[-1])
+        ).to_numpy()
+        n_changes = total(change_df, mask=first_last)
+        changes["Score_change"] = total(change_df, change_df["Mean_diff"], first_last) / n_changes
+        changes["Significant_shifts"] = total(
+            change_df, change_df["p_value"] < 0.05, first_last
+        ).astype(int)
+
+    quant_df = data["quant_df"]
+    n_outcomes = total(quant_df)
+    mean_effect = total(quant_df, quant_df["Effect_size"]) / n_outcomes * 100
+    sig_share = total(quant_df, quant_df["p_value"] < 0.05) / n_outcomes * 100
+
+    qual_df = data["qual_df"]
+    themes = pd.Categorical(qual_df["Thematic_group"], categories=QUAL_THEMATIC_GROUPS).codes
+    by_theme = np.bincount(
+        qual_df["Accelerator_id"].to_numpy() * len(QUAL_THEMATIC_GROUPS) + themes,
+        qual_df["Mentions"].to_numpy(),
+        minlength=n * len(QUAL_THEMATIC_GROUPS),
+    ).reshape(n, -1)
+
+    vfi = data["vfi_df"].set_index("Accelerator_id").reindex(range(n))
+    return pd.DataFrame(
+        {
+            "Accelerator": ACCELERATORS,
+            "Place": data["accelerator_df"]["Place"].to_numpy(),
+            "Mean_score": mean_score,
+            **changes,
+            "Mean_effect_ppts": mean_effect,
+            "Sig_share": sig_share,
+            "Coded_segments": by_theme.sum(axis=1).astype(int),
+            "Top_theme": np.asarray(QUAL_THEMATIC_GROUPS, dtype=object)[by_theme.argmax(axis=1)],
+            "Cost_per_participant": vfi["Cost_per_participant"].to_numpy(),
+            "Benefit_per_participant": vfi["Benefit_per_participant"].to_numpy(),
+            "Benefit_cost_ratio": vfi["Benefit_cost_ratio"].to_numpy(),
+        },
+        index=pd.RangeIndex(n, name="Accelerator_id"),
+    )
+
+
+def likert_matrices(survey_df, column="Percent"):
+    # Chart-ready Likert percentages (or counts) per battery, shaped
+    # (accelerator, wave, question, option) in ACCELERATORS / SURVEY_WAVES /
+    # BATTERIES order, so the survey tab indexes one (question x option) slice
+    import numpy as np
+    import pandas as pd
+
+    matrices = {}
+    for battery, meta in BATTERIES.items():
+        sub = survey_df[survey_df["Battery"] == battery]
+        axes = [
+            ("Accelerator_id", range(len(ACCELERATORS))),
+            ("Wave", SURVEY_WAVES),
+            ("Question", meta["questions"]),
+            ("Likert", meta["likert_options"]),
+        ]
+        matrix = np.zeros([len(values) for _, values in axes])
+        codes = tuple(pd.Categorical(sub[col], categories=values).codes for col, values in axes)
+        matrix[codes] = sub[column].to_numpy()
+        matrix.flags.writeable = False
+        matrices[battery] = matrix
+    return matrices
+
+
+def build_segments(qual_df, seed=QUAL_SEGMENT_SEED):
+    # One dummy coded segment per mention in qual_df, carrying the same codes.
+    # Text is kept as indices into the phrase banks (see segment_texts) and the
+    # code columns as categoricals, so millions of segments stay small.
+    # Each accelerator draws from its own generator (seeded by seed and
+    # Accelerator_id), so the rows of one accelerator in qual_df give the same
+    # segments, Document_ids included, as the whole of qual_df does.
+    import numpy as np
+    import pandas as pd
+
+    source = np.repeat(np.arange(len(qual_df)), qual_df["Mentions"].to_numpy())
+    n = len(source)
+    segments = pd.DataFrame(
+        {"Accelerator_id": qual_df["Accelerator_id"].to_numpy()[source]}
+    )
+    for col, categories in [
+        ("Document_group", QUAL_DOC_GROUPS),
+        ("Phase", QUAL_PHASES),
+        ("Level", QUAL_LEVELS),
+        ("Thematic_group", QUAL_THEMATIC_GROUPS),
+    ]:
+        codes = pd.Categorical(qual_df[col], categories=categories).codes
+        segments[col] = pd.Categorical.from_codes(codes[source], categories)
+    accelerators = segments["Accelerator_id"].to_numpy()
+    themes = segments["Thematic_group"].cat.codes.to_numpy()
+    # Spread each (accelerator, document group, phase) over QUAL_DOCS_PER_GROUP
+    # documents. Every document leans towards a few themes, so themes co-occur
+    # unevenly, as they would in real transcripts.
+    n_groups = len(QUAL_DOC_GROUPS) * len(QUAL_PHASES)
+    groups = (
+        segments["Document_group"].cat.codes.to_numpy() * len(QUAL_PHASES)
+        + segments["Phase"].cat.codes.to_numpy()
+    )
+
+    actors = np.empty(n, dtype=np.int8)
+    details = np.empty(n, dtype=np.int8)
+    # Finding: position in the flattened QUAL_SEGMENT_FINDINGS banks
+    findings = np.empty(n, dtype=np.int8)
+    doc = np.empty(n, dtype=np.int64)
+    order = np.argsort(accelerators, kind="stable")
+    ids, starts = np.unique(accelerators[order], return_index=True)
+    for acc_id, rows in zip(ids, np.split(order, starts[1:])):
+        rng = np.random.default_rng([seed, acc_id])
+        m = len(rows)
+        actors[rows] = rng.integers(len(QUAL_SEGMENT_ACTORS), size=m)
+        details[rows] = rng.integers(len(QUAL_SEGMENT_DETAILS), size=m)
+        acc_themes = themes[rows]
+        acc_findings = np.empty(m, dtype=np.int8)
+        offset = 0
+        for t, bank in enumerate(QUAL_SEGMENT_FINDINGS.values()):
+            in_theme = acc_themes == t
+            acc_findings[in_theme] = offset + rng.integers(len(bank), size=in_theme.sum())
+            offset += len(bank)
+        findings[rows] = acc_findings
+
+        affinity = rng.gamma(
+            0.3, size=(n_groups, QUAL_DOCS_PER_GROUP, len(QUAL_THEMATIC_GROUPS))
+        )
+        cdf = np.cumsum(affinity[groups[rows], :, acc_themes], axis=1)
+        doc[rows] = (rng.random(m)[:, None] * cdf[:, -1:] > cdf).sum(axis=1)
+    doc = np.minimum(doc, QUAL_DOCS_PER_GROUP - 1)
+
+    segments["Actor"] = actors
+    segments["Detail"] = details
+    segments["Finding"] = findings
+    segments["Document_id"] = (accelerators * n_groups + groups) * QUAL_DOCS_PER_GROUP + doc
+
+    segments.insert(0, "Segment_id", pd.RangeIndex(n))
+    return segments
+
+
+def segment_texts(segments):
+    # Excerpt text of each segment from build_segments, generated on the fly
+    actors = QUAL_SEGMENT_ACTORS
+    findings = [finding for bank in QUAL_SEGMENT_FINDINGS.values() for finding in bank]
+    details = QUAL_SEGMENT_DETAILS
+    levels = [level.lower() for level in QUAL_LEVELS]
+    phases = [phase.lower() for phase in QUAL_PHASES]
+    for actor, finding, detail, level, phase in zip(
+        segments["Actor"].to_numpy(),
+        segments["Finding"].to_numpy(),
+        segments["Detail"].to_numpy(),
+        segments["Level"].cat.codes.to_numpy(),
+        segments["Phase"].cat.codes.to_numpy(),
+    ):
+        yield (
+            f"{actors[actor]} {findings[finding]} {details[detail]} "
+            f"({levels[level]}, {phases[phase]})."
+        )
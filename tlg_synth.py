@@ -0,0 +1,285 @@
+"""Synthetic TLG evaluation datasets for load-testing the dashboard.
+
+Generates the survey, quant, qual and VfI tables for any number of
+accelerators (the real ten first, then synthetic ones) and survey waves.
+Every accelerator draws from its own random stream, spawned from one
+SeedSequence, so a dataset is reproducible from its seed whatever the
+number of worker processes, and any accelerator's data is the same in a
+small and a large run. Blocks of accelerators are generated in parallel and
+written as Parquet partitioned by block, with a manifest.json describing the
+dataset. Point the dashboard at it with TLG_DATA_DIR=<out>.
+
+    python tlg_synth.py --accelerators 1000 --out synthetic/1k
+    python tlg_synth.py --accelerators 10000 --waves 6 --workers 8 --seed 7 --out synthetic/10k
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from tlg_data import (
+    BATTERIES,
+    OUTCOMES,
+    QUAL_DOC_GROUPS,
+    QUAL_LEVELS,
+    QUAL_PHASES,
+    QUAL_THEMATIC_GROUPS,
+    REAL_ACCELERATOR_DIM,
+)
+
+TABLES = ["survey_df", "quant_df", "qual_df", "vfi_df"]
+# Bump when the generator's distributions or schema change
+GENERATOR_VERSION = 1
+RESPONDENTS = 80
+
+
+# ---------------------------------------------------------
+# PER-ACCELERATOR DRAWS
+# ---------------------------------------------------------
+def _draw(seed_seq, n_waves):
+    # All random draws for one accelerator from its own stream, with the same
+    # distributions as tlg_data.build_dummy_data
+    rng = np.random.default_rng(seed_seq)
+    counts = {
+        battery: rng.multinomial(
+            RESPONDENTS,
+            rng.dirichlet(
+                np.ones(len(meta["likert_options"])), size=(n_waves, len(meta["questions"]))
+            ),
+        )
+        for battery, meta in BATTERIES.items()
+    }
+    n_out = len(OUTCOMES)
+    quant = np.stack(
+        [
+            rng.normal(0.05, 0.04, n_out),
+            rng.uniform(0.01, 0.03, n_out),
+            rng.uniform(0.01, 0.25, n_out),
+        ]
+    )
+    base = rng.integers(5, 20, size=(len(QUAL_DOC_GROUPS), len(QUAL_PHASES), len(QUAL_LEVELS), 1))
+    mentions = np.maximum(base + rng.integers(-5, 10, size=base.shape[:3] + (len(QUAL_THEMATIC_GROUPS),)), 0)
+    cost = rng.uniform(800, 1800)
+    vfi = (cost, cost * rng.uniform(0.8, 2.0))
+    return counts, quant, mentions, vfi
+
+
+def _frames(ids, draws, waves):
+    # Stack one block's draws into the dashboard's table layouts
+    n = len(ids)
+    counts, quant, mentions, vfi = (list(d) for d in zip(*draws))
+
+    survey = []
+    for battery, meta in BATTERIES.items():
+        c = np.stack([block[battery] for block in counts])  # (accelerator, wave, question, option)
+        n_q, n_opt = c.shape[2:]
+        scores = np.array(
+            [np.nan if meta["has_dk"] and "Don’t know" in opt else i
+             for i, opt in enumerate(meta["likert_options"], start=1)]
+        )
+        percent = c.ravel() / RESPONDENTS * 100
+        survey.append(
+            pd.DataFrame(
+                {
+                    "Accelerator_id": np.repeat(ids, len(waves) * n_q * n_opt),
+                    "Wave": np.tile(np.repeat(waves, n_q * n_opt), n),
+                    "Battery": battery,
+                    "Question": np.tile(np.repeat(meta["questions"], n_opt), n * len(waves)),
+                    "Likert": np.tile(meta["likert_options"], n * len(waves) * n_q),
+                    "Score": np.tile(scores, n * len(waves) * n_q),
+                    "Count": c.ravel(),
+                    "Percent": percent,
+                }
+            )
+        )
+    survey_df = pd.concat(survey, ignore_index=True)
+    survey_df["Weighted"] = survey_df["Score"] * survey_df["Percent"]
+
+    q = np.stack(quant)  # (accelerator, [effect, se, p], outcome)
+    eff, se, p = q[:, 0].ravel(), q[:, 1].ravel(), q[:, 2].ravel()
+    quant_df = pd.DataFrame(
+        {
+            "Accelerator_id": np.repeat(ids, len(OUTCOMES)),
+            "Outcome": np.tile(OUTCOMES, n),
+            "Effect_size": eff,
+            "CI_low": eff - 1.96 * se,
+            "CI_high": eff + 1.96 * se,
+            "p_value": p,
+        }
+    )
+
+    m = np.stack(mentions)  # (accelerator, doc group, phase, level, theme)
+    per_acc = m[0].size
+    qual_df = pd.DataFrame(
+        {
+            "Accelerator_id": np.repeat(ids, per_acc),
+            "Document_group": np.tile(np.repeat(QUAL_DOC_GROUPS, per_acc // len(QUAL_DOC_GROUPS)), n),
+            "Phase": np.tile(
+                np.repeat(QUAL_PHASES, len(QUAL_LEVELS) * len(QUAL_THEMATIC_GROUPS)),
+                n * len(QUAL_DOC_GROUPS),
+            ),
+            "Level": np.tile(
+                np.repeat(QUAL_LEVELS, len(QUAL_THEMATIC_GROUPS)),
+                n * len(QUAL_DOC_GROUPS) * len(QUAL_PHASES),
+            ),
+            "Thematic_group": np.tile(QUAL_THEMATIC_GROUPS, n * per_acc // len(QUAL_THEMATIC_GROUPS)),
+            "Mentions": m.ravel(),
+        }
+    )
+
+    v = np.asarray(vfi)
+    vfi_df = pd.DataFrame(
+        {
+            "Accelerator_id": ids,
+            "Cost_per_participant": v[:, 0],
+            "Benefit_per_participant": v[:, 1],
+            "Benefit_cost_ratio": v[:, 1] / v[:, 0],
+        }
+    )
+    return {"survey_df": survey_df, "quant_df": quant_df, "qual_df": qual_df, "vfi_df": vfi_df}
+
+
+def _write_block(block, ids, seed_seqs, waves, out_dir):
+    # Runs in a worker process: generate and write one block of accelerators
+    frames = _frames(np.asarray(ids), [_draw(s, len(waves)) for s in seed_seqs], waves)
+    for name, df in frames.items():
+        part_dir = os.path.join(out_dir, name, f"block={block:05d}")
+        os.makedirs(part_dir, exist_ok=True)
+        df.to_parquet(os.path.join(part_dir, "part-0.parquet"), index=False)
+    return {name: len(df) for name, df in frames.items()}
+
+
+# ---------------------------------------------------------
+# DATASETS
+# ---------------------------------------------------------
+def synthetic_accelerator(i):
+    # Dimension row for the i-th synthetic accelerator, spread over a rough
+    # England bounding box
+    return (
+        f"Synthetic accelerator {i + 1:04d}",
+        f"Synthetic place {i + 1:04d}",
+        50.5 + (i * 0.37) % 4.5,
+        -4.5 + (i * 0.53) % 6.0,
+    )
+
+
+def accelerator_dim(n_accelerators):
+    # The real accelerators first, then synthetic ones
+    real = list(REAL_ACCELERATOR_DIM[:n_accelerators])
+    return real + [synthetic_accelerator(i) for i in range(n_accelerators - len(real))]
+
+
+def _is_dataset(path):
+    # A directory generate() wrote: it has a manifest with the generator's keys
+    try:
+        with open(os.path.join(path, "manifest.json"), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return False
+    return isinstance(manifest, dict) and {"version", "seed", "accelerators"} <= manifest.keys()
+
+
+def generate(out_dir, n_accelerators, n_waves=3, seed=42, block_size=250, workers=None, force=False):
+    # Write a dataset to out_dir and return its manifest. An existing out_dir is
+    # only replaced if it is empty or an earlier dataset, unless force is set.
+    if n_accelerators < 1 or n_waves < 1:
+        raise ValueError("need at least one accelerator and one wave")
+    if os.path.exists(out_dir):
+        if not os.path.isdir(out_dir):
+            raise ValueError(f"{out_dir} exists and is not a directory")
+        if os.listdir(out_dir) and not (force or _is_dataset(out_dir)):
+            raise ValueError(
+                f"{out_dir} exists and is not a tlg_synth dataset; "
+                "choose another --out or pass --force"
+            )
+    waves = [f"Wave {i + 1}" for i in range(n_waves)]
+    streams = np.random.SeedSequence(seed).spawn(n_accelerators)
+    blocks = [
+        (b, list(range(start, min(start + block_size, n_accelerators))))
+        for b, start in enumerate(range(0, n_accelerators, block_size))
+    ]
+
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+    rows = dict.fromkeys(TABLES, 0)
+    with ProcessPoolExecutor(workers) as pool:
+        futures = [
+            pool.submit(_write_block, b, ids, streams[ids[0]:ids[-1] + 1], waves, out_dir)
+            for b, ids in blocks
+        ]
+        for future in futures:
+            for name, count in future.result().items():
+                rows[name] += count
+
+    manifest = {
+        "version": GENERATOR_VERSION,
+        "seed": seed,
+        "waves": waves,
+        "block_size": block_size,
+        "rows": rows,
+        "accelerators": [list(row) for row in accelerator_dim(n_accelerators)],
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    return manifest
+
+
+def read_dataset(data_dir):
+    # Tables in the layout of tlg_data.build_dummy_data
+    with open(os.path.join(data_dir, "manifest.json"), encoding="utf-8") as fh:
+        manifest = json.load(fh)
+    accelerator_df = pd.DataFrame(manifest["accelerators"], columns=["Accelerator", "Place", "lat", "lon"])
+    accelerator_df.insert(0, "Accelerator_id", np.arange(len(accelerator_df)))
+    data = {"accelerator_df": accelerator_df}
+    for name in TABLES:
+        df = pd.read_parquet(os.path.join(data_dir, name))
+        data[name] = df.drop(columns="block").sort_values("Accelerator_id", kind="stable").reset_index(drop=True)
+    return data
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--accelerators", type=int, default=1000, help="Number of accelerators")
+    parser.add_argument("--waves", type=int, default=3, help="Survey waves")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--block-size", type=int, default=250, help="Accelerators per partition")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default=os.path.join("synthetic", "tlg"), help="Output directory")
+    parser.add_argument(
+        "--force", action="store_true", help="Replace --out even if it is not an earlier dataset"
+    )
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    try:
+        manifest = generate(
+            args.out,
+            args.accelerators,
+            args.waves,
+            args.seed,
+            args.block_size,
+            args.workers,
+            args.force,
+        )
+    except ValueError as exc:
+        parser.error(str(exc))
+    elapsed = time.perf_counter() - start
+    total = sum(manifest["rows"].values())
+    print(
+        f"Generated {args.accelerators:,} accelerators x {args.waves} waves "
+        f"({total:,} rows) in {elapsed:.2f}s -> {args.out}"
+    )
+    for name, count in manifest["rows"].items():
+        print(f"  {name:<10}{count:>12,}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())